@@ -2,57 +2,50 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import datetime, timedelta
 import logging
+from ssl import SSLContext
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.util.ssl import client_context
 from homeassistant.const import Platform
-from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
 
 from cool_open_client.hvac_units_factory import HVACUnitsFactory
 from cool_open_client.cool_automation_client import (
     CoolAutomationClient,
     InvalidTokenException,
 )
-from cool_open_client.ws_events import Reconnected, UnitUpdate
+from cool_open_client.unit import HVACUnit
+from cool_open_client.utils.units_payload import ensure_dict, extract_units_mapping
 
-from .const import DOMAIN, PLATFORMS
+from .cache import UnitCatalogCache
+from .const import (
+    CATALOG_CHECK_INTERVAL_HOURS,
+    CONF_SHARD_BY_DEVICE,
+    CONF_WS_COALESCE_MS,
+    CONF_WS_RECORD,
+    DATA_WS_HUB,
+    DEFAULT_WS_COALESCE_MS,
+    DOMAIN,
+    PLATFORMS,
+)
 from .coordinator import CoolAutomationDataUpdateCoordinator
+from .services import async_setup_services
+from .session import async_get_ssl_context, async_share_session
+from .ws_hub import WsHub
+from .ws_recording import WsRecorder
 
 # TODO List the platforms that you want to support.
 # For your initial PR, limit it to 1 platform.
 
 _LOGGER = logging.getLogger(__name__)
 
-
-async def _ws_pump(coordinator: "CoolAutomationDataUpdateCoordinator") -> None:
-    """Forever-loop consumer of the library's WS event stream.
-
-    Mutates in-memory `HVACUnit` instances per `UnitUpdate` and triggers a
-    bulk reconcile on each `Reconnected`. Cancellation propagates so HA
-    can stop us cleanly during entry unload.
-    """
-    client = coordinator.client
-    units_by_id = {u.id: u for u in coordinator.units}
-
-    try:
-        async for event in client.subscribe_unit_updates():
-            if isinstance(event, UnitUpdate):
-                unit = units_by_id.get(event.message.unit_id)
-                if unit is None:
-                    continue
-                unit._update_unit(event.message)
-                coordinator.async_set_updated_data(coordinator.data)
-            elif isinstance(event, Reconnected):
-                await coordinator.async_request_refresh()
-    except asyncio.CancelledError:
-        raise
-    except Exception:
-        _LOGGER.exception(
-            "WS pump terminated unexpectedly; entry will rely on the "
-            "5-minute reconciliation poll until reload",
-        )
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 @callback
@@ -130,22 +123,61 @@ def _async_migrate_unique_ids(
         registry.async_update_entity(old_entity_id, new_unique_id=new_unique_id)
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up CoolAutomation Cloud Open Integration from a config entry."""
+class _PrefetchedUnitsClient:
+    """The client, answering the unit list from a response already fetched."""
 
-    # hass.data[DOMAIN] = config
-    # conf: ConfigType | None = config.get(DOMAIN)
+    def __init__(self, client: CoolAutomationClient, response: Any) -> None:
+        self._client = client
+        self._response = response
 
-    # if conf is None:
-    #     # If we have a config entry, setup is done by that config entry.
-    #     # If there is no config entry, this should fail.
-    #     return bool(hass.config_entries.async_entries(DOMAIN))
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
 
-    _LOGGER.debug("async setup")
-    # Build the SSL context off the event loop once, then thread it through
-    # every cool-open-client call site so the library never blocks the loop
-    # reading the system CA bundle.
-    ssl_ctx = await hass.async_add_executor_job(client_context)
+    async def get_controllable_units(self) -> Any:
+        return self._response
+
+
+def _unit_devices(response: Any) -> dict[str, str]:
+    """Return the controller of each unit in a unit list response."""
+    devices: dict[str, str] = {}
+    for unit_id, payload in extract_units_mapping(response.data).items():
+        unit = ensure_dict(payload)
+        if (device := unit.get("device")) is not None:
+            devices[unit.get("id") or unit_id] = device
+    return devices
+
+
+async def _async_build_units(
+    client: CoolAutomationClient, with_devices: bool
+) -> tuple[list[HVACUnit], dict[str, str] | None]:
+    """Build the units from the cloud, with their controllers if asked.
+
+    HVACUnit does not keep the parent device of the REST payload. When the
+    controllers are wanted, the unit list is fetched once and handed to the
+    factory instead of being downloaded twice.
+    """
+    # Reuse the client: HVACUnitsFactory.create() would build another
+    # one and fetch the dictionaries a second time.
+    if not with_devices:
+        return await HVACUnitsFactory(client).generate_units_from_api(), None
+    response = await client.get_controllable_units()
+    units_factory = HVACUnitsFactory(_PrefetchedUnitsClient(client, response))
+    return await units_factory.generate_units_from_api(), _unit_devices(response)
+
+
+async def _async_connect(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    ssl_ctx: SSLContext,
+    with_devices: bool = False,
+) -> tuple[CoolAutomationClient, list[HVACUnit], dict[str, str] | None]:
+    """Create the client and build the units from the cloud.
+
+    The controller of each unit is returned too when `with_devices` is
+    set, and None otherwise. Raises ConfigEntryNotReady if the cloud cannot
+    be reached and ConfigEntryAuthFailed if the stored credentials no
+    longer work.
+    """
     token = entry.data["token"]
     try:
         client = await CoolAutomationClient.create(token=token, ssl_context=ssl_ctx)
@@ -172,8 +204,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.error("General Error: %s", error)
         raise ConfigEntryNotReady() from error
     try:
-        units_factory = await HVACUnitsFactory.create(token=token, ssl_context=ssl_ctx)
-        units = await units_factory.generate_units_from_api()
+        units, devices = await _async_build_units(client, with_devices)
         if not units:
             raise ConfigEntryNotReady
     except OSError as error:
@@ -184,24 +215,238 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception as error:
         _LOGGER.error("General Error: %s", error)
         raise ConfigEntryNotReady() from error
+    return client, units, devices
+
+
+async def _async_fetch_unit_devices(
+    client: CoolAutomationClient,
+) -> dict[str, str] | None:
+    """Return the controller each unit belongs to, or None on failure."""
+    try:
+        return _unit_devices(await client.get_controllable_units())
+    except Exception as error:  # pylint: disable=broad-except
+        _LOGGER.warning("Cannot fetch the controllers of the units: %s", error)
+        return None
 
-    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
-    await coordinator.async_config_entry_first_refresh()
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
-    entry.async_create_background_task(
-        hass,
-        _ws_pump(coordinator),
-        name=f"{DOMAIN}_ws_pump",
+
+def _shard_units(
+    units: list[HVACUnit], devices: dict[str, str]
+) -> dict[str | None, list[HVACUnit]]:
+    """Group `units` by controller, keyed by the controller id.
+
+    An account with a single controller is not worth sharding and comes
+    back as one group keyed by None.
+    """
+    shards: dict[str | None, list[HVACUnit]] = {}
+    for unit in units:
+        shards.setdefault(devices.get(unit.id, "unknown"), []).append(unit)
+    if len(shards) < 2:
+        return {None: units}
+    return shards
+
+
+async def _async_validate_catalog(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinators: list[CoolAutomationDataUpdateCoordinator],
+    cache: UnitCatalogCache,
+    cached: dict[str, Any],
+    ssl_ctx: SSLContext,
+) -> None:
+    """Check a catalog restored from the cache against the cloud.
+
+    A changed catalog, or units that moved to another controller of a
+    sharded entry, is saved and the entry reloaded so entities and shards
+    match it; otherwise a reconcile replaces the restored state with the
+    live one.
+    """
+    sharded = bool(entry.options.get(CONF_SHARD_BY_DEVICE))
+    try:
+        client, units, fetched = await _async_connect(hass, entry, ssl_ctx, sharded)
+    except ConfigEntryAuthFailed:
+        entry.async_start_reauth(hass)
+        return
+    except ConfigEntryNotReady:
+        _LOGGER.warning(
+            "Cloud unreachable; running on the cached unit catalog until the "
+            "next reconcile succeeds"
+        )
+        return
+    if not cache.async_catalog_matches(cached, client, units) or (
+        fetched is not None and fetched != cache.devices
+    ):
+        _LOGGER.info("Unit catalog changed in the cloud, reloading")
+        cache.async_track(client, units, fetched)
+        await cache.async_save()
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    await asyncio.gather(
+        *(coordinator.async_refresh() for coordinator in coordinators)
     )
+
+
+async def _async_check_catalog(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: CoolAutomationDataUpdateCoordinator,
+    cache: UnitCatalogCache,
+) -> None:
+    """Reload the entry if the cloud's unit catalog changed.
+
+    The reconcile and the WS carry state only, so added or removed units
+    and changed names, modes or limits reach Home Assistant this way.
+    """
+    coordinator.async_record_request("catalog")
+    try:
+        units, devices = await _async_build_units(
+            coordinator.client, bool(entry.options.get(CONF_SHARD_BY_DEVICE))
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        _LOGGER.debug("Catalog check failed: %s", error)
+        return
+    if not units or (
+        not cache.async_catalog_changed(coordinator.client, units)
+        and (devices is None or devices == cache.devices)
+    ):
+        return
+    _LOGGER.info("Unit catalog changed in the cloud, reloading")
+    cache.async_track(coordinator.client, units, devices)
+    await cache.async_save()
+    hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration services."""
+    async_setup_services(hass)
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up CoolAutomation Cloud Open Integration from a config entry."""
+
+    # hass.data[DOMAIN] = config
+    # conf: ConfigType | None = config.get(DOMAIN)
+
+    # if conf is None:
+    #     # If we have a config entry, setup is done by that config entry.
+    #     # If there is no config entry, this should fail.
+    #     return bool(hass.config_entries.async_entries(DOMAIN))
+
+    _LOGGER.debug("async setup")
+    # Build the SSL context off the event loop once, then thread it through
+    # every cool-open-client call site so the library never blocks the loop
+    # reading the system CA bundle.
+    ssl_ctx = await async_get_ssl_context(hass)
+    await async_share_session(hass, ssl_ctx)
+    cache = UnitCatalogCache(hass, entry)
+    if (cached := await cache.async_load()) is not None:
+        # Boot from the stored catalog so entities exist even while the
+        # cloud is slow or down; it is validated in the background below.
+        client, units = cache.async_restore(cached, entry.data["token"], ssl_ctx)
+    else:
+        client, units, fetched = await _async_connect(
+            hass, entry, ssl_ctx, bool(entry.options.get(CONF_SHARD_BY_DEVICE))
+        )
+    devices: dict[str, str] | None = None
+    if entry.options.get(CONF_SHARD_BY_DEVICE):
+        if cached is None:
+            devices = fetched
+        elif cached.get("devices"):
+            devices = cached["devices"]
+        else:
+            # Sharding was just turned on, or an older version saved an
+            # empty map: the cache does not know the controllers.
+            devices = await _async_fetch_unit_devices(client)
+    cache.async_track(client, units, devices)
+
+    # One coordinator per controller when sharding, so each one reconciles
+    # on its own schedule and only wakes the entities of its own units.
+    coordinators: list[CoolAutomationDataUpdateCoordinator] = []
+    for shard, shard_units in _shard_units(units, devices or {}).items():
+        first = coordinators[0] if coordinators else None
+        coordinator = CoolAutomationDataUpdateCoordinator(
+            hass,
+            entry,
+            client,
+            shard_units,
+            coalesce_window=entry.options.get(
+                CONF_WS_COALESCE_MS, DEFAULT_WS_COALESCE_MS
+            )
+            / 1000,
+            shard=shard,
+            # The account's rate limit, latency figures and bulk request
+            # span all shards.
+            command_queue=None if first is None else first.command_queue,
+            latency=None if first is None else first.latency,
+            bulk_fetch=None if first is None else first.bulk_fetch,
+        )
+        # The units were just built from the API or the cache: seed the
+        # coordinator with them and leave the first bulk reconcile to the
+        # schedule (or the catalog validation) instead of blocking startup.
+        coordinator.async_set_updated_data({unit.id: unit for unit in shard_units})
+        entry.async_on_unload(
+            coordinator.async_add_listener(cache.async_schedule_save)
+        )
+        coordinator.async_schedule_reconcile()
+        coordinators.append(coordinator)
+    cache.async_schedule_save()
+    # A reload must find the state as it was at unload, not a minute before.
+    entry.async_on_unload(cache.async_save)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinators
+    if entry.options.get(CONF_WS_RECORD):
+        recorder = WsRecorder(
+            hass, hass.config.path(DOMAIN, f"ws-{entry.entry_id}.ndjson.gz")
+        )
+        for coordinator in coordinators:
+            coordinator.ws_recorder = recorder
+        # Registered first so it runs last, after the WS is unsubscribed.
+        entry.async_on_unload(recorder.async_close)
+    # The shards of an entry share one WS connection, opened with the
+    # entry's own token rather than whichever the client singleton holds.
+    ws_hub: WsHub = hass.data[DOMAIN].setdefault(DATA_WS_HUB, WsHub(hass))
+    for coordinator in coordinators:
+        entry.async_on_unload(
+            ws_hub.async_subscribe(entry.data["token"], coordinator)
+        )
+
+    async def _async_check_catalog_on_schedule(_now: datetime) -> None:
+        await _async_check_catalog(hass, entry, coordinators[0], cache)
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            _async_check_catalog_on_schedule,
+            timedelta(hours=CATALOG_CHECK_INTERVAL_HOURS),
+        )
+    )
+    if cached is not None:
+        entry.async_create_background_task(
+            hass,
+            _async_validate_catalog(
+                hass, entry, coordinators, cache, cached, ssl_ctx
+            ),
+            name=f"{DOMAIN}_validate_catalog",
+        )
     _async_migrate_unique_ids(hass, entry, units)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     # hass.config_entries.async_setup_platforms(entry, PLATFORMS)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cached unit catalog of a removed entry."""
+    await UnitCatalogCache(hass, entry).async_remove()
@@ -0,0 +1,187 @@
+"""Persistent cache of the unit catalog and last known unit state."""
+from __future__ import annotations
+
+import json
+from ssl import SSLContext
+from typing import Any
+
+from cool_open_client.cool_automation_client import CoolAutomationClient
+from cool_open_client.unit import HVACUnit
+from cool_open_client.utils.dictionaries import DictTypes
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import CACHE_SAVE_DELAY, DOMAIN
+
+STORAGE_VERSION = 1
+
+# Client dictionaries mapping the API's integer codes to mode names. They
+# are part of the catalog: commands and WS messages are translated with them.
+_DICTIONARIES = (
+    "temperature_scale",
+    "operation_statuses",
+    "operation_modes",
+    "fan_modes",
+    "swing_modes",
+)
+
+
+def _unit_catalog(unit: HVACUnit) -> dict[str, Any]:
+    """Return what `unit` is: identity, capabilities and limits."""
+    return {
+        "id": unit.id,
+        "name": unit.name,
+        "temperature_range": unit._temperature_range,
+        "supported_operation_statuses": unit._supported_operation_statuses,
+        "supported_operation_modes": unit._supported_operation_modes,
+        "supported_fan_modes": unit._supported_fan_modes,
+        "supported_swing_modes": unit._supported_swing_modes,
+        "is_half_degree": unit.is_half_degree,
+    }
+
+
+def _unit_state(unit: HVACUnit) -> dict[str, Any]:
+    """Return the state `unit` was last known in."""
+    return {
+        "setpoint": unit.setpoint,
+        "operation_status": unit.operation_status,
+        "operation_mode": unit.operation_mode,
+        "ambient_temperature": unit.ambient_temperature,
+        "fan_mode": unit.fan_mode,
+        "swing_mode": unit.swing_mode,
+    }
+
+
+def _catalog(client: CoolAutomationClient, units: list[HVACUnit]) -> dict[str, Any]:
+    """Return the catalog of `units` as it reads back from storage."""
+    catalog = {
+        "dictionaries": {
+            name: dict(getattr(client, name).data) for name in _DICTIONARIES
+        },
+        "units": [_unit_catalog(unit) for unit in units],
+    }
+    # Stored JSON has string keys and lists for tuples; compare like with like.
+    return json.loads(json.dumps(catalog))
+
+
+class UnitCatalogCache:
+    """Stores an entry's unit catalog and last known state.
+
+    Lets the entry create its entities without reaching the cloud, which is
+    then consulted in the background to validate what was restored.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the cache of `entry`."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        self._client: CoolAutomationClient | None = None
+        self._units: list[HVACUnit] = []
+        self._devices: dict[str, str] | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the stored catalog and state, or None if there is none."""
+        return await self._store.async_load()
+
+    @callback
+    def async_restore(
+        self, cached: dict[str, Any], token: str, ssl_context: SSLContext
+    ) -> tuple[CoolAutomationClient, list[HVACUnit]]:
+        """Build a client and units from `cached` without any request."""
+        # CoolAutomationClient.create() would fetch the dictionaries; set up
+        # the same client state from the cached ones instead.
+        client = CoolAutomationClient(ssl_context=ssl_context)
+        client.token = token
+        for name in _DICTIONARIES:
+            setattr(client, name, DictTypes(cached["dictionaries"][name]))
+        units = [
+            HVACUnit(
+                unit["id"],
+                unit["name"],
+                active_setpoint=unit["state"]["setpoint"],
+                active_operation_status=unit["state"]["operation_status"],
+                active_operation_mode=unit["state"]["operation_mode"],
+                ambient_temperature=unit["state"]["ambient_temperature"],
+                active_fan_mode=unit["state"]["fan_mode"],
+                active_swing_mode=unit["state"]["swing_mode"],
+                temerature_range=unit["temperature_range"],
+                supported_operation_statuses=unit["supported_operation_statuses"],
+                supported_operation_modes=unit["supported_operation_modes"],
+                supported_fan_modes=unit["supported_fan_modes"],
+                supported_swing_modes=unit["supported_swing_modes"],
+                is_half_degree=unit["is_half_degree"],
+                client=client,
+            )
+            for unit in cached["units"]
+        ]
+        return client, units
+
+    @callback
+    def async_track(
+        self,
+        client: CoolAutomationClient,
+        units: list[HVACUnit],
+        devices: dict[str, str] | None = None,
+    ) -> None:
+        """Make `client`, `units` and their `devices` what the cache saves.
+
+        `devices` maps unit ids to the controller they belong to; it is only
+        known, and only saved, when the entry shards its units by
+        controller. The tracked devices are kept when it is not given.
+        """
+        self._client = client
+        self._units = units
+        if devices is not None:
+            self._devices = devices
+
+    @callback
+    def async_catalog_matches(
+        self, cached: dict[str, Any], client: CoolAutomationClient, units: list[HVACUnit]
+    ) -> bool:
+        """Return whether `client` and `units` have the catalog of `cached`."""
+        catalog = _catalog(client, units)
+        return catalog["dictionaries"] == cached["dictionaries"] and catalog[
+            "units"
+        ] == [
+            {key: value for key, value in unit.items() if key != "state"}
+            for unit in cached["units"]
+        ]
+
+    @property
+    def devices(self) -> dict[str, str] | None:
+        """Return the tracked controller of each unit, if known."""
+        return self._devices
+
+    @callback
+    def async_catalog_changed(
+        self, client: CoolAutomationClient, units: list[HVACUnit]
+    ) -> bool:
+        """Return whether `units` differ in catalog from the tracked units."""
+        return _catalog(client, units)["units"] != _catalog(client, self._units)["units"]
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the tracked catalog and state after CACHE_SAVE_DELAY."""
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Save the tracked catalog and state now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored catalog."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the tracked catalog with each unit's current state."""
+        assert self._client is not None
+        catalog = _catalog(self._client, self._units)
+        for unit, stored in zip(self._units, catalog["units"]):
+            stored["state"] = _unit_state(unit)
+        if self._devices is not None:
+            catalog["devices"] = self._devices
+        return catalog
@@ -1,22 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable
 import logging
 from typing import Any
 
+from cool_open_client.cool_automation_client import UnitUpdateMessage
 from cool_open_client.unit import HVACUnit
 
 from homeassistant.components.climate import ClimateEntity
-from homeassistant.components.climate.const import (
-    FAN_AUTO,
-    FAN_HIGH,
-    FAN_LOW,
-    FAN_MEDIUM,
-    FAN_MIDDLE,
-    FAN_TOP,
-    ClimateEntityFeature,
-    HVACMode,
-)
+from homeassistant.components.climate.const import ClimateEntityFeature, HVACMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_TEMPERATURE,
@@ -24,14 +17,13 @@ from homeassistant.const import (
     PRECISION_WHOLE,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, REFRESH_DELAY
+from .const import COMMAND_CONFIRM_TIMEOUT, DOMAIN
 from .coordinator import CoolAutomationDataUpdateCoordinator
+from .entity import CoolAutomationUnitBaseEntity
 
 # Fan Modes ['LOW', 'MEDIUM', 'HIGH', 'AUTO', 'TOP', 'VERYLOW']
 # Operation Modes ['COOL', 'HEAT', 'DRY', 'FAN', 'AUTO']
@@ -46,15 +38,20 @@ OPEN_CLIENT_TO_HA_MODES = {
     "AUTO": HVACMode.HEAT_COOL,
 }
 
-OPEN_CLIENT_TO_HA_FAN_MODES = {
-    "VERYLOW": FAN_LOW,
-    "LOW": FAN_MEDIUM,
-    "MEDIUM": FAN_MIDDLE,
-    "HIGH": FAN_HIGH,
-    "TOP": FAN_TOP,
-    "AUTO": FAN_AUTO,
+HA_TO_OPEN_CLIENT_MODES = {
+    ha_mode: mode for mode, ha_mode in OPEN_CLIENT_TO_HA_MODES.items()
 }
 
+
+def _ha_fan_mode(mode: str) -> str:
+    """Return how Home Assistant shows the cloud fan mode `mode`.
+
+    The cloud's fan modes come from its dictionary and vary by unit and
+    brand (e.g. 'FU-LO'), so they are title-cased rather than mapped onto
+    Home Assistant's fixed fan constants.
+    """
+    return mode.capitalize()
+
 CELSIUS = UnitOfTemperature.CELSIUS
 
 _LOGGER = logging.getLogger(__package__)
@@ -65,10 +62,13 @@ async def async_setup_entry(
 ) -> None:
     """Set up the climate entry."""
 
-    coordinator: CoolAutomationDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinators: list[CoolAutomationDataUpdateCoordinator] = hass.data[DOMAIN][
+        entry.entry_id
+    ]
 
     entities = [
         CoolAutomationUnitEntity(coordinator, unit_id)
+        for coordinator in coordinators
         for unit_id, _ in coordinator.data.items()
     ]
 
@@ -76,33 +76,24 @@ async def async_setup_entry(
     _LOGGER.debug("Entities added to HA")
 
 
-class CoolAutomationUnitEntity(
-    CoordinatorEntity[CoolAutomationDataUpdateCoordinator], ClimateEntity
-):
+class CoolAutomationUnitEntity(CoolAutomationUnitBaseEntity, ClimateEntity):
     """HVAC Entity of CoolAutomation controllable HVAC unit."""
 
-    _attr_has_entity_name = True
+    # The main feature of the unit's device: named after the device.
+    _attr_name = None
 
     def __init__(
         self, coordinator: CoolAutomationDataUpdateCoordinator, unit_id: str
     ) -> None:
         """Initiate SensiboClimate."""
-        super().__init__(coordinator)
-        self._device_id = unit_id
-
-        self.__attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self.unit_data.id)},
-            name=self.unit_data.name,
-            manufacturer="CoolAutomations",
-            suggested_area=self.unit_data.name,
-        )
+        super().__init__(coordinator, unit_id)
 
-        self._client = coordinator.client
         self.unit: HVACUnit = coordinator.data[unit_id]
         self._attr_unique_id = self.unit.id
         self._attr_temperature_unit = CELSIUS
-        self._attr_supported_features = self.get_supported_features()
-        self._attr_precision = self.get_precision()
+        self._build_capability_attributes()
+        # Requested values shown until the cloud confirms or ignores them.
+        self._optimistic: dict[str, Any] = {}
 
     @property
     def unit_data(self) -> HVACUnit:
@@ -114,17 +105,114 @@ class CoolAutomationUnitEntity(
         """
         return self.coordinator.data[self._device_id]
 
+    def _build_capability_attributes(self) -> None:
+        """Derive the attributes that follow from what the unit supports.
+
+        Called once from __init__, rather than on every state write. What a
+        unit supports only changes through a reload: the catalog check
+        reloads the entry when the cloud reports different modes or limits.
+        """
+        hvac_modes = [
+            OPEN_CLIENT_TO_HA_MODES[mode]
+            for mode in self.unit.operation_modes
+            if mode in OPEN_CLIENT_TO_HA_MODES
+        ]
+        hvac_modes.append(HVACMode.OFF)
+        self._attr_hvac_modes = hvac_modes
+        # Cloud fan mode -> the name shown in HA, and back.
+        self._ha_fan_modes = {
+            mode: _ha_fan_mode(mode) for mode in self.unit.fan_modes or ()
+        }
+        self._cloud_fan_modes = {
+            ha_mode: mode for mode, ha_mode in self._ha_fan_modes.items()
+        }
+        self._attr_fan_modes = list(self._ha_fan_modes.values()) or None
+        # Raw cloud modes the hvac mode setter validates against.
+        self._operation_modes = frozenset(self.unit.operation_modes or ())
+        self._attr_supported_features = self.get_supported_features()
+        self._attr_precision = self.get_precision()
+        self._attr_target_temperature_step = 0.5 if self.unit.is_half_degree else 1
+
+    async def _async_command(
+        self,
+        confirmed: Callable[[UnitUpdateMessage], bool],
+        *commands: tuple[str, Callable[[], Awaitable[None]]],
+        **optimistic: Any,
+    ) -> None:
+        """Send `commands` in order and wait for the WS to confirm them.
+
+        Each command is a (field, command) pair queued through the
+        coordinator. If a newer command for the same field supersedes one
+        before it is sent, the rest of the sequence is still sent but this
+        call leaves confirmation to the newer one.
+        The `optimistic` attribute values are shown right away. Completes as
+        soon as an `UPDATE_UNIT` satisfying `confirmed` arrives for this
+        unit. If none arrives within COMMAND_CONFIRM_TIMEOUT, only this unit
+        is refreshed over HTTP; if that still does not show the requested
+        state, the optimistic values are rolled back with a warning. Errors
+        from the commands roll back and propagate.
+        """
+        self._optimistic.update(optimistic)
+        self.async_write_ha_state()
+        # Expect before sending: the echo can beat the HTTP response.
+        expectation = self.coordinator.async_expect_unit_update(
+            self._device_id, confirmed
+        )
+        superseded = False
+        try:
+            for field, command in commands:
+                if not await self.coordinator.async_send_command(
+                    self._device_id, field, command
+                ):
+                    superseded = True
+        except Exception:
+            expectation.cancel()
+            self._async_clear_optimistic(optimistic)
+            raise
+        if superseded:
+            expectation.cancel()
+            self._async_clear_optimistic(optimistic)
+            return
+        try:
+            async with asyncio.timeout(COMMAND_CONFIRM_TIMEOUT):
+                await expectation
+        except TimeoutError:
+            _LOGGER.debug("No WS confirmation for %s, refreshing it", self.entity_id)
+            message = await self.coordinator.async_refresh_unit(self._device_id)
+            if message is None or not confirmed(message):
+                _LOGGER.warning(
+                    "%s did not apply %s; rolling back", self.entity_id, optimistic
+                )
+        self._async_clear_optimistic(optimistic)
+
+    @callback
+    def _async_clear_optimistic(self, optimistic: dict[str, Any]) -> None:
+        """Show the unit's real state again for the `optimistic` attributes.
+
+        Values a newer command has replaced in the meantime are kept.
+        """
+        for key, value in optimistic.items():
+            if self._optimistic.get(key) == value:
+                del self._optimistic[key]
+        self.async_write_ha_state()
+
     async def async_turn_on(self) -> None:
         """Turn HVAC unit on."""
-        await self.unit.turn_on()
-        await asyncio.sleep(REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
+        await self._async_command(
+            lambda message: message.operation_status == "on",
+            ("operation_status", self.unit.turn_on),
+            hvac_mode=OPEN_CLIENT_TO_HA_MODES.get(
+                self.unit.operation_mode, HVACMode.OFF
+            ),
+        )
 
     async def async_turn_off(self) -> None:
         """Turn HVAC unit off."""
-        await self.unit.turn_off()
-        await asyncio.sleep(REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
+        await self._async_command(
+            lambda message: message.operation_status == "off",
+            ("operation_status", self.unit.turn_off),
+            hvac_mode=HVACMode.OFF,
+        )
 
     def get_precision(self) -> float:
         """Get Temperature.
@@ -150,28 +238,15 @@ class CoolAutomationUnitEntity(
         supported |= ClimateEntityFeature.TURN_OFF
         return supported
 
-    @property
-    def name(self) -> str:
-        return self.unit.name
-
     @property
     def hvac_mode(self) -> HVACMode:
         """Return hvac operation."""
+        if "hvac_mode" in self._optimistic:
+            return self._optimistic["hvac_mode"]
         if self.unit.is_on:
             return OPEN_CLIENT_TO_HA_MODES.get(self.unit.operation_mode, HVACMode.OFF)
         return HVACMode.OFF
 
-    @property
-    def hvac_modes(self) -> list[HVACMode]:
-        """Return the list of available hvac operation modes."""
-        hvac_modes = [
-            OPEN_CLIENT_TO_HA_MODES[mode]
-            for mode in self.unit.operation_modes
-            if mode in OPEN_CLIENT_TO_HA_MODES
-        ]
-        hvac_modes.append(HVACMode.OFF)
-        return hvac_modes if hvac_modes else [HVACMode.OFF]
-
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
@@ -180,35 +255,35 @@ class CoolAutomationUnitEntity(
     @property
     def target_temperature(self) -> float | None:
         """Return the temperature we try to reach."""
+        if "target_temperature" in self._optimistic:
+            return self._optimistic["target_temperature"]
         return self.unit.setpoint if self.unit.is_on else None
 
-    @property
-    def target_temperature_step(self) -> float | None:
-        """Return the supported step of target temperature."""
-        return 0.5 if self.unit.is_half_degree else 1
-
     @property
     def fan_mode(self) -> str | None:
         """Return the fan setting."""
-        return self.unit.fan_mode.capitalize() if self.unit.fan_mode else None
+        if "fan_mode" in self._optimistic:
+            return self._optimistic["fan_mode"]
+        if not (mode := self.unit.fan_mode):
+            return None
+        # The unit may report a mode it does not list as supported.
+        return self._ha_fan_modes.get(mode) or _ha_fan_mode(mode)
 
     @property
-    def fan_modes(self) -> list[str] | None:
-        """Return the swing setting."""
-        fan_modes = self.unit.fan_modes
-        return [mode.capitalize() for mode in fan_modes] if fan_modes else None
+    def swing_modes(self) -> list[str] | None:
+        """Return the swing modes.
+
+        Not cached: the unit offers only "off" while it is turned off.
+        """
+        return self.unit.swing_modes or None
 
     @property
     def swing_mode(self) -> str | None:
         """Return the current swing setting."""
+        if "swing_mode" in self._optimistic:
+            return self._optimistic["swing_mode"]
         return self.unit.swing_mode if self.unit.swing_mode else None
 
-    @property
-    def swing_modes(self) -> list[str] | None:
-        """Return the list of available swing modes."""
-        swing_modes = self.unit.swing_modes
-        return [mode for mode in swing_modes] if swing_modes else None
-
     @property
     def min_temp(self) -> float:
         """Return the minimum temperature."""
@@ -236,9 +311,17 @@ class CoolAutomationUnitEntity(
             return
 
         new_temp = self._get_valid_temperature(temperature)
-        rounded_temp = round(new_temp)
+        rounded_temp = int(round(new_temp))
         try:
-            await self.unit.set_temperature_set_point(int(rounded_temp))
+            await self._async_command(
+                lambda message: message.setpoint is not None
+                and round(message.setpoint) == rounded_temp,
+                (
+                    "setpoint",
+                    lambda: self.unit.set_temperature_set_point(rounded_temp),
+                ),
+                target_temperature=rounded_temp,
+            )
         except Exception as error:
             _LOGGER.error("Failed to set temperature: %s", error)
             # Check if this is the known API validation error
@@ -250,8 +333,6 @@ class CoolAutomationUnitEntity(
                     "Please check for a newer version or report this issue."
                 ) from error
             raise HomeAssistantError(f"Temperature setting failed: {error}") from error
-        await asyncio.sleep(REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
 
     def _get_valid_temperature(self, target: float) -> float:
         if target <= self.min_temp:
@@ -266,36 +347,39 @@ class CoolAutomationUnitEntity(
         fan_mode: str - fan mode to set
 
         """
-        if not self.unit.fan_modes:
+        if not self._cloud_fan_modes:
             raise HomeAssistantError("Current mode doesn't support setting Fanlevel")
 
         if not fan_mode or not fan_mode.strip():
             raise ValueError("Fan mode cannot be empty")
 
-        # HA returns the display-cased value exposed by the `fan_modes` property
-        # (which title-cases the API modes via `.capitalize()`). Normalize back
-        # to the API's uppercase form before validating and sending.
-        normalized = fan_mode.strip().upper()
-        available_modes = list(self.unit.fan_modes)
+        # HA returns the value exposed by the `fan_modes` property; service
+        # calls may also pass the cloud's own uppercase spelling.
+        normalized = self._cloud_fan_modes.get(_ha_fan_mode(fan_mode.strip()))
 
-        if normalized not in available_modes:
+        if normalized is None:
             raise ValueError(
-                f"Fan mode {fan_mode} is not valid. Valid fan modes are: {', '.join(available_modes)}"
+                f"Fan mode {fan_mode} is not valid. Valid fan modes are: {', '.join(self.unit.fan_modes)}"
             )
 
         try:
-            await self.unit.set_fan_mode(normalized)
+            await self._async_command(
+                lambda message: message.fan_mode == normalized,
+                ("fan_mode", lambda: self.unit.set_fan_mode(normalized)),
+                fan_mode=self._ha_fan_modes[normalized],
+            )
         except Exception as error:
             _LOGGER.error("Failed to set fan mode: %s", error)
             raise HomeAssistantError(f"Fan mode setting failed: {error}") from error
-        await asyncio.sleep(REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
 
     async def async_set_swing_mode(self, swing_mode: str) -> None:
         """Set new target swing operation.
         swing_mode: str - swing mode to set
         """
-        if not self.unit.swing_modes:
+        # Checked against the unit's live list, not a set built once: the
+        # unit offers only "off" while it is turned off.
+        swing_modes = self.unit.swing_modes
+        if not swing_modes:
             raise HomeAssistantError("Current mode doesn't support setting swing mode")
 
         if not swing_mode or not swing_mode.strip():
@@ -305,46 +389,48 @@ class CoolAutomationUnitEntity(
         # unlike fan modes no case normalization is needed — only strip stray
         # whitespace so validation and the sent value stay consistent.
         normalized = swing_mode.strip()
-        available_modes = list(self.unit.swing_modes)
-        if normalized not in available_modes:
+        if normalized not in swing_modes:
             raise ValueError(
-                f"Swing mode {swing_mode} is not valid. Valid swing modes are: {', '.join(available_modes)}"
+                f"Swing mode {swing_mode} is not valid. Valid swing modes are: {', '.join(swing_modes)}"
             )
 
         try:
-            await self.unit.set_swing_mode(normalized)
+            await self._async_command(
+                lambda message: message.swing == normalized,
+                ("swing", lambda: self.unit.set_swing_mode(normalized)),
+                swing_mode=normalized,
+            )
         except Exception as error:
             _LOGGER.error("Failed to set swing mode: %s", error)
             raise HomeAssistantError(f"Swing mode setting failed: {error}") from error
-        await asyncio.sleep(REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target operation mode."""
-        turn_on = False
         if hvac_mode == HVACMode.OFF:
-            await self.unit.turn_off()
-            await asyncio.sleep(REFRESH_DELAY)
-            await self.coordinator.async_request_refresh()
+            await self.async_turn_off()
             return
-        if self.hvac_mode == HVACMode.OFF:
-            turn_on = True
+        # The unit's own status, not the optimistic hvac_mode: a pending
+        # command that turns it on may still be superseded.
+        turn_on = not self.unit.is_on
 
-        _LOGGER.debug(str(OPEN_CLIENT_TO_HA_MODES))
-        mode = [k for k, v in OPEN_CLIENT_TO_HA_MODES.items() if v == hvac_mode]
+        mode = HA_TO_OPEN_CLIENT_MODES.get(hvac_mode)
         _LOGGER.debug("Changing mode to %s", mode)
-        if not mode:
+        if mode is None or mode not in self._operation_modes:
             raise ValueError("Unsupported mode was provided")
 
+        # API has typo in method name: set_opration_mode (missing 'e')
+        commands = [("operation_mode", lambda: self.unit.set_opration_mode(mode))]
+        if turn_on:
+            commands.append(("operation_status", self.unit.turn_on))
         try:
-            # API has typo in method name: set_opration_mode (missing 'e')
-            await self.unit.set_opration_mode(mode[0])
+            await self._async_command(
+                lambda message: message.operation_mode == mode
+                and message.operation_status == "on",
+                *commands,
+                hvac_mode=hvac_mode,
+            )
         except Exception as error:
             _LOGGER.error("Failed to set operation mode: %s", error)
             raise HomeAssistantError(
                 f"Operation mode setting failed: {error}"
             ) from error
-        if turn_on:
-            await self.unit.turn_on()
-        await asyncio.sleep(REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
@@ -0,0 +1,150 @@
+"""Rate-limited outbound command queue for the CoolAutomation cloud API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__package__)
+
+
+class CommandQueue:
+    """Send unit commands under a token-bucket rate limit.
+
+    Commands are keyed, typically by (unit id, field). A command submitted
+    while an older one with the same key is still queued replaces it in
+    place: only the latest setpoint, mode or fan reaches the API, and the
+    superseded submitter learns its command was dropped.
+
+    Up to `burst` commands are in flight at once, so one slow request does
+    not hold up the others. Commands sharing a key never overlap: a newer
+    one waits until the one in flight has completed, keeping their order.
+    """
+
+    def __init__(self, hass: HomeAssistant, rate: float, burst: int) -> None:
+        """Allow `rate` commands per second on average, `burst` at once."""
+        self.hass = hass
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = hass.loop.time()
+        self._pending: dict[
+            Hashable, tuple[Callable[[], Awaitable[None]], asyncio.Future[bool]]
+        ] = {}
+        self._drain: asyncio.Task[None] | None = None
+        self._in_flight: set[Hashable] = set()
+        self._sends: set[asyncio.Task[None]] = set()
+        # Set when a send completes or a command is queued.
+        self._wakeup = asyncio.Event()
+        # Commands sent to the API, and commands superseded before sending.
+        self.sent = 0
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of commands waiting to be sent."""
+        return len(self._pending)
+
+    async def async_submit(
+        self, key: Hashable, command: Callable[[], Awaitable[None]]
+    ) -> bool:
+        """Queue `command` and wait for it to be sent.
+
+        Returns True once the command completed, or False if a newer
+        command with the same `key` superseded it first. Errors raised by
+        the command propagate.
+        """
+        future: asyncio.Future[bool] = self.hass.loop.create_future()
+        if (superseded := self._pending.get(key)) is not None:
+            _, superseded_future = superseded
+            if not superseded_future.done():
+                superseded_future.set_result(False)
+            self.dropped += 1
+        # Assigning an existing key keeps its place in line.
+        self._pending[key] = (command, future)
+        self._wakeup.set()
+        if self._drain is None:
+            self._drain = self.hass.async_create_background_task(
+                self._async_drain(), name="cool_open_integration command queue"
+            )
+        return await future
+
+    @callback
+    def _async_take_token(self) -> float:
+        """Take a token; return how long to wait first if none is available."""
+        now = self.hass.loop.time()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    async def _async_drain(self) -> None:
+        """Start queued commands in order until the queue is empty."""
+        try:
+            while self._pending:
+                key = next(
+                    (key for key in self._pending if key not in self._in_flight),
+                    None,
+                )
+                if key is None or len(self._in_flight) >= self.burst:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                if delay := self._async_take_token():
+                    await asyncio.sleep(delay)
+                    continue
+                command, future = self._pending.pop(key)
+                if future.done():
+                    # The submitter stopped waiting; do not send for nobody.
+                    self._tokens += 1
+                    continue
+                self.sent += 1
+                self._in_flight.add(key)
+                send = self.hass.async_create_background_task(
+                    self._async_send(key, command, future),
+                    name="cool_open_integration command",
+                )
+                self._sends.add(send)
+                send.add_done_callback(self._sends.discard)
+        finally:
+            self._drain = None
+
+    async def _async_send(
+        self,
+        key: Hashable,
+        command: Callable[[], Awaitable[None]],
+        future: asyncio.Future[bool],
+    ) -> None:
+        """Send one command and report the outcome to its submitter."""
+        try:
+            await command()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:  # pylint: disable=broad-except
+            if not future.done():
+                future.set_exception(error)
+        else:
+            if not future.done():
+                future.set_result(True)
+        finally:
+            self._in_flight.discard(key)
+            self._wakeup.set()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop sending and drop every queued command."""
+        if self._drain is not None:
+            self._drain.cancel()
+            self._drain = None
+        for send in self._sends:
+            send.cancel()
+        for _, future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
@@ -8,7 +8,7 @@ import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.schema_config_entry_flow import (
@@ -18,9 +18,16 @@ from homeassistant.helpers.schema_config_entry_flow import (
 from collections.abc import Mapping
 
 from cool_open_client.cool_automation_client import CoolAutomationClient
-from homeassistant.util.ssl import client_context
 
-from .const import DOMAIN, TITLE
+from .const import (
+    CONF_SHARD_BY_DEVICE,
+    CONF_WS_COALESCE_MS,
+    CONF_WS_RECORD,
+    DEFAULT_WS_COALESCE_MS,
+    DOMAIN,
+    TITLE,
+)
+from .session import async_get_ssl_context, async_share_session
 
 _LOGGER = logging.getLogger(__package__)
 
@@ -32,8 +39,18 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_WS_COALESCE_MS, default=DEFAULT_WS_COALESCE_MS): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=1000)
+        ),
+        vol.Optional(CONF_WS_RECORD, default=False): bool,
+        vol.Optional(CONF_SHARD_BY_DEVICE, default=False): bool,
+    }
+)
+
 OPTIONS_FLOW = {
-    "init": SchemaFlowFormStep(STEP_USER_DATA_SCHEMA),
+    "init": SchemaFlowFormStep(OPTIONS_SCHEMA),
 }
 
 
@@ -43,7 +60,9 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
 
-    ssl_ctx = await hass.async_add_executor_job(client_context)
+    ssl_ctx = await async_get_ssl_context(hass)
+    # authenticate() uses a throwaway REST client that it closes itself, so
+    # it must keep its own session rather than borrow the shared one.
     token = await CoolAutomationClient.authenticate(
         data["username"], data["password"], ssl_context=ssl_ctx
     )
@@ -51,6 +70,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     if token == "Unauthorized":
         raise InvalidAuth
 
+    await async_share_session(hass, ssl_ctx)
     api: CoolAutomationClient = await CoolAutomationClient.create(
         token, logger=_LOGGER, ssl_context=ssl_ctx
     )
@@ -148,23 +168,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         #     step_id="reauth_perform", data_schema=STEP_USER_DATA_SCHEMA
         # )
 
-    # @staticmethod
-    # @callback
-    # def async_get_options_flow(
-    #     config_entry: config_entries.ConfigEntry,
-    # ) -> CoolOpenIntegrationOptionsFlowHandler:
-    #     """Get the options flow for this handler."""
-    #     return CoolOpenIntegrationOptionsFlowHandler(config_entry)
-
-
-# class CoolOpenIntegrationOptionsFlowHandler(config_entries.OptionsFlow):
-#     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
-#         """Initialize CoolOpenIntegration options flow."""
-#         self.arm_options = config_entry.options.get(OPTIONS_ARM, DEFAULT_ARM_OPTIONS)
-#         self.zone_options = config_entry.options.get(
-#             OPTIONS_ZONES, DEFAULT_ZONE_OPTIONS
-#         )
-#         self.selected_zone = None
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SchemaOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return SchemaOptionsFlowHandler(config_entry, OPTIONS_FLOW)
 
 
 class CannotConnect(HomeAssistantError):
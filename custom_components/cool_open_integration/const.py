@@ -4,8 +4,42 @@ from homeassistant.const import Platform
 
 
 DOMAIN = "cool_open_integration"
+DATA_SSL_CONTEXT = f"{DOMAIN}_ssl_context"
+# Key of the WsHub in hass.data[DOMAIN], beside the coordinators per entry.
+DATA_WS_HUB = "ws_hub"
 TITLE = "Cool Automation Cloud Open Integration"
-PLATFORMS = [Platform.CLIMATE]
+PLATFORMS = [Platform.CLIMATE, Platform.SENSOR]
 TEMP_CELSIUS = "°C"
-REFRESH_DELAY = 3.0
+COMMAND_CONFIRM_TIMEOUT = 3.0
+REFRESH_BATCH_WINDOW = 0.5
+SET_UNITS_CONCURRENCY = 8
+# Seconds to batch unit state changes before writing the catalog cache.
+CACHE_SAVE_DELAY = 60
+# Outbound commands per second on average, and how many may be in flight at once.
+COMMAND_RATE_LIMIT = 5.0
+COMMAND_BURST = 10
 RECONCILE_INTERVAL_MINUTES = 5
+RECONCILE_MIN_INTERVAL_MINUTES = 1
+RECONCILE_MAX_INTERVAL_MINUTES = 30
+# How often the unit list is re-read for added, removed or changed units.
+CATALOG_CHECK_INTERVAL_HOURS = 6
+# Backoff, in seconds, before restarting a WS pump that stopped; a pump that
+# ran for WS_RESTART_RESET_SECONDS restarts from the base delay again.
+WS_RESTART_BASE_DELAY = 5
+WS_RESTART_MAX_DELAY = 300
+WS_RESTART_RESET_SECONDS = 300
+# Samples kept per push-path latency histogram.
+LATENCY_WINDOW = 500
+
+SERVICE_SET_UNITS = "set_units"
+
+CONF_WS_COALESCE_MS = "ws_coalesce_ms"
+DEFAULT_WS_COALESCE_MS = 100
+CONF_WS_RECORD = "ws_record"
+# WS recordings: seconds between writes, and size at which a file rotates
+# along with how many rotated files are kept.
+WS_RECORD_FLUSH_INTERVAL = 5
+WS_RECORD_MAX_BYTES = 5 * 1024 * 1024
+WS_RECORD_BACKUPS = 3
+# Give the units of each controller their own coordinator.
+CONF_SHARD_BY_DEVICE = "shard_by_device"
@@ -1,18 +1,130 @@
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
 import logging
+from typing import TYPE_CHECKING
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from cool_open_client.cool_automation_client import CoolAutomationClient
+from cool_open_client.cool_automation_client import (
+    CoolAutomationClient,
+    UnitUpdateMessage,
+)
 from cool_open_client.unit import HVACUnit
 
-from .const import DOMAIN, RECONCILE_INTERVAL_MINUTES
+from .command_queue import CommandQueue
+from .const import (
+    COMMAND_BURST,
+    COMMAND_RATE_LIMIT,
+    DOMAIN,
+    RECONCILE_INTERVAL_MINUTES,
+    RECONCILE_MAX_INTERVAL_MINUTES,
+    RECONCILE_MIN_INTERVAL_MINUTES,
+    REFRESH_BATCH_WINDOW,
+)
+from .stats import RollingPercentiles
+
+if TYPE_CHECKING:
+    from .ws_recording import WsRecorder
 
 _LOGGER = logging.getLogger(__package__)
 
+# (UnitUpdateMessage attribute, HVACUnit attribute) pairs of the state the
+# entities render. Used to fingerprint a unit and detect no-op updates.
+_STATE_FIELDS = (
+    ("operation_mode", "operation_mode"),
+    ("operation_status", "operation_status"),
+    ("setpoint", "setpoint"),
+    ("ambient_temperature", "ambient_temperature"),
+    ("fan_mode", "fan_mode"),
+    ("swing", "swing_mode"),
+)
+_TEMPERATURE_FIELDS = ("setpoint", "ambient_temperature")
+
+# Stages timed in `CoolAutomationDataUpdateCoordinator.latency`: the WS push
+# path, and the round trip of an outbound command.
+LATENCY_APPLY = "apply"
+LATENCY_RECEIVE_TO_WRITE = "receive_to_write"
+LATENCY_COMMAND = "command"
+
+
+def _unit_fingerprint(unit: HVACUnit) -> tuple:
+    """Return the rendered state of `unit` as a comparable tuple."""
+    return tuple(getattr(unit, attr) for _, attr in _STATE_FIELDS)
+
+
+def _drifted_fields(held: tuple, message: UnitUpdateMessage) -> list[str]:
+    """Return the `HVACUnit` attributes `message` would change on a unit.
+
+    `held` is the fingerprint of the state the WS path gave the unit.
+    """
+    return [
+        attr
+        for (_, attr), held_value, incoming in zip(
+            _STATE_FIELDS, held, _message_fingerprint(message)
+        )
+        if held_value != incoming
+    ]
+
+
+def _message_fingerprint(message: UnitUpdateMessage) -> tuple:
+    """Return the state `message` would leave its unit in.
+
+    Temperatures are rounded the same way `HVACUnit._update_unit` stores them
+    so a message is comparable to `_unit_fingerprint` of the unit.
+    """
+    return tuple(
+        HVACUnit._round_temperature(getattr(message, field))
+        if field in _TEMPERATURE_FIELDS
+        else getattr(message, field)
+        for field, _ in _STATE_FIELDS
+    )
+
+
+class BulkUnitFetch:
+    """Shares one in-flight bulk unit request between its callers.
+
+    The cloud only answers for the whole account. The shards of an entry
+    each apply their own units, so a shard asking while a request is in
+    flight joins it instead of sending another.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: CoolAutomationClient) -> None:
+        """Initialize the fetch of every unit of `client`'s account."""
+        self.hass = hass
+        self._client = client
+        self._request: asyncio.Task[dict[str, UnitUpdateMessage]] | None = None
+
+    @property
+    def in_flight(self) -> bool:
+        """Whether a request is being answered."""
+        return self._request is not None
+
+    async def async_fetch(self) -> dict[str, UnitUpdateMessage]:
+        """Return the state of every unit, joining a request in flight."""
+        if self._request is None:
+            self._request = self.hass.async_create_task(
+                self._client.get_updated_controllable_units()
+            )
+            self._request.add_done_callback(self._async_request_done)
+        # A caller giving up must not cancel the request for the others.
+        return await asyncio.shield(self._request)
+
+    @callback
+    def _async_request_done(self, request: asyncio.Task) -> None:
+        """Let the next caller send a fresh request."""
+        if self._request is request:
+            self._request = None
+        # Each caller sees the error; don't also log it as unretrieved.
+        if not request.cancelled():
+            request.exception()
+
 
 class CoolAutomationDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Coolmaster data."""
@@ -20,19 +132,89 @@ class CoolAutomationDataUpdateCoordinator(DataUpdateCoordinator):
     data: dict[str, HVACUnit]
 
     def __init__(
-        self, hass: HomeAssistant, entry: ConfigEntry, client: CoolAutomationClient, units: list[HVACUnit]
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: CoolAutomationClient,
+        units: list[HVACUnit],
+        coalesce_window: float = 0,
+        shard: str | None = None,
+        command_queue: CommandQueue | None = None,
+        latency: dict[str, RollingPercentiles] | None = None,
+        bulk_fetch: BulkUnitFetch | None = None,
     ) -> None:
-        """Initialize global Coolmaster data updater."""
+        """Initialize global Coolmaster data updater.
+
+        `coalesce_window` is the number of seconds WS updates are buffered
+        per unit before being applied; 0 applies every update immediately.
+        When the entry is sharded, `shard` names the controller whose units
+        this coordinator holds, and the shards pass each other the
+        `command_queue`, `latency` histograms and `bulk_fetch` of the entry.
+        """
         _LOGGER.debug("Init Cool Automation update coordinator")
         self._client = client
         self.hass = hass
         self.units = units
+        self.shard = shard
+        self._units_by_id = {unit.id: unit for unit in units}
+        self._unit_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self.coalesce_window = coalesce_window
+        self._pending_updates: dict[str, UnitUpdateMessage] = {}
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._fingerprints = {unit.id: _unit_fingerprint(unit) for unit in units}
+        self._expectations: dict[
+            str, list[tuple[Callable[[UnitUpdateMessage], bool], asyncio.Future[None]]]
+        ] = {}
+        # Unit refreshes waiting for the current batch, by unit id.
+        self._refresh_waiters: dict[
+            str, list[asyncio.Future[UnitUpdateMessage | None]]
+        ] = {}
+        self._unsub_refresh_batch: CALLBACK_TYPE | None = None
+        # Refresh requests served by a round trip another request triggered.
+        self.coalesced_refreshes = 0
+        # WS updates dropped because they matched the state already held.
+        self.suppressed_updates = 0
+        self.reconcile_interval = timedelta(minutes=RECONCILE_INTERVAL_MINUTES)
+        # When the last bulk reconcile succeeded; None until the first one.
+        self.last_reconcile: datetime | None = None
+        # Seconds the last bulk reconcile took, successful or not.
+        self.last_reconcile_duration: float | None = None
+        # Whether the last reconcile found state the WS path had not delivered.
+        self.last_reconcile_drifted = False
+        # Per-unit, per-field count of values the reconcile had to correct.
+        self.drift_counts: dict[str, Counter[str]] = {}
+        self.last_drift: datetime | None = None
+        self._unsub_reconcile: CALLBACK_TYPE | None = None
+        self._reconcile_stopped = False
+        self.ws_running = False
+        self.ws_reconnects = 0
+        # Loop times of the WS updates received in the last minute.
+        self._recent_ws_events: deque[float] = deque()
+        # Where the WS events of this entry are recorded, if opted in.
+        self.ws_recorder: WsRecorder | None = None
+        self._reconnected_since_reconcile = False
+        # When the first WS update still waiting to be written per unit was
+        # received, on the loop clock.
+        self._received_at: dict[str, float] = {}
+        # Rolling timings, by stage.
+        self.latency = latency or {
+            LATENCY_APPLY: RollingPercentiles(),
+            LATENCY_RECEIVE_TO_WRITE: RollingPercentiles(),
+            LATENCY_COMMAND: RollingPercentiles(),
+        }
+        self.command_queue = command_queue or CommandQueue(
+            hass, COMMAND_RATE_LIMIT, COMMAND_BURST
+        )
+        self.bulk_fetch = bulk_fetch or BulkUnitFetch(hass, client)
+        # Cloud API calls issued for this entry, by kind.
+        self.request_counts: Counter[str] = Counter()
+        self.request_counts_since = dt_util.utcnow()
 
+        # No update_interval: DataUpdateCoordinator re-arms its timer on every
+        # async_set_updated_data/refresh, so WS traffic could postpone the
+        # reconcile forever. We keep our own fixed schedule instead.
         super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=RECONCILE_INTERVAL_MINUTES),
+            hass, _LOGGER, name=DOMAIN if shard is None else f"{DOMAIN} {shard}"
         )
 
     async def _async_update_data(self):
@@ -43,8 +225,23 @@ class CoolAutomationDataUpdateCoordinator(DataUpdateCoordinator):
         instances. Replaces the previous per-unit fan-out which caused
         excessive API traffic on large installations.
         """
+        start = self.hass.loop.time()
         try:
-            updates = await self._client.get_updated_controllable_units()
+            updates = await self._async_fetch_units("reconcile")
+        finally:
+            self.last_reconcile_duration = self.hass.loop.time() - start
+        return self._async_apply_units(updates)
+
+    async def _async_fetch_units(self, kind: str) -> dict[str, UnitUpdateMessage]:
+        """Fetch the state of every unit in one bulk request.
+
+        A request another shard already has in flight is joined, and only
+        counted against the shard that sent it, as a `kind` request.
+        """
+        if not self.bulk_fetch.in_flight:
+            self.async_record_request(kind)
+        try:
+            return await self.bulk_fetch.async_fetch()
         except OSError as error:
             raise UpdateFailed from error
         except Exception as error:
@@ -53,18 +250,391 @@ class CoolAutomationDataUpdateCoordinator(DataUpdateCoordinator):
             # failures both land here (same surface as the prior code).
             raise UpdateFailed(f"Bulk unit update failed: {error}") from error
 
+    @callback
+    def _async_apply_units(
+        self, updates: dict[str, UnitUpdateMessage]
+    ) -> dict[str, HVACUnit]:
+        """Apply a bulk response to the units and return the new data."""
+        now = dt_util.utcnow()
         data: dict[str, HVACUnit] = {}
+        drifted = False
         for unit in self.units:
             message = updates.get(unit.id)
             if message is not None:
+                # A WS update still in the coalescing window was received
+                # before this response: it is delivered state, not drift,
+                # and must not overwrite the response once flushed.
+                pending = self._pending_updates.pop(unit.id, None)
+                self._received_at.pop(unit.id, None)
+                held = (
+                    _unit_fingerprint(unit)
+                    if pending is None
+                    else _message_fingerprint(pending)
+                )
+                # Diff before applying: anything that differs is state the WS
+                # path had not delivered, i.e. drift this poll corrected.
+                if fields := _drifted_fields(held, message):
+                    drifted = True
+                    self.drift_counts.setdefault(unit.id, Counter()).update(fields)
+                    _LOGGER.debug("Reconcile corrected %s on %s", fields, unit.id)
                 # The coordinator notifies listeners itself; the library no longer
                 # exposes a with_callback parameter on _update_unit.
                 unit._update_unit(message)
+                self._async_resolve_expectations(message)
             # A unit absent from the bulk response keeps its last-known state.
             data[unit.id] = unit
+            self._fingerprints[unit.id] = _unit_fingerprint(unit)
             unit.reset_update()
+        self.last_reconcile = now
+        self.last_reconcile_drifted = drifted
+        if drifted:
+            self.last_drift = now
         return data
 
+    @property
+    def drift_by_field(self) -> Counter[str]:
+        """Corrections made by the reconcile, summed over all units."""
+        return sum(self.drift_counts.values(), Counter())
+
+    @callback
+    def async_record_request(self, kind: str) -> None:
+        """Count one cloud API call of `kind` against this entry."""
+        self.request_counts[kind] += 1
+
+    @property
+    def requests_per_day(self) -> float:
+        """Average cloud API calls per day since counting started."""
+        elapsed = dt_util.utcnow() - self.request_counts_since
+        days = max(elapsed / timedelta(days=1), 1 / (24 * 60))
+        return sum(self.request_counts.values()) / days
+
+    @property
+    def ws_events_per_minute(self) -> int:
+        """WS updates received during the last minute."""
+        self._async_prune_ws_events()
+        return len(self._recent_ws_events)
+
+    @callback
+    def _async_prune_ws_events(self) -> None:
+        """Forget WS updates received more than a minute ago."""
+        horizon = self.hass.loop.time() - 60
+        while self._recent_ws_events and self._recent_ws_events[0] < horizon:
+            self._recent_ws_events.popleft()
+
+    @callback
+    def async_set_ws_running(self, running: bool) -> None:
+        """Record whether the WS pump is consuming events.
+
+        When a running pump stops, nothing pushes updates any more, so the
+        armed reconcile is brought forward to RECONCILE_MIN_INTERVAL_MINUTES;
+        the interval stretches again once the pump is back and healthy.
+        """
+        went_down = self.ws_running and not running
+        self.ws_running = running
+        if went_down and self._unsub_reconcile is not None:
+            self.reconcile_interval = timedelta(minutes=RECONCILE_MIN_INTERVAL_MINUTES)
+            self.async_schedule_reconcile()
+
+    async def async_handle_reconnected(self) -> None:
+        """Reconcile after the WS came back; updates may have been missed."""
+        self.ws_reconnects += 1
+        self._reconnected_since_reconcile = True
+        await self.async_request_refresh()
+
+    @callback
+    def async_schedule_reconcile(self) -> None:
+        """Arm the reconcile timer one `reconcile_interval` from now.
+
+        The timer is independent of the push path: neither WS updates nor
+        on-demand refreshes move it, so the drift-correcting bulk poll runs
+        at least once per interval however chatty the site is.
+        """
+        self._async_unsub_reconcile()
+        if self._reconcile_stopped:
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._unsub_reconcile = async_call_later(
+            self.hass, self.reconcile_interval, self._async_reconcile_on_schedule
+        )
+
+    async def _async_reconcile_on_schedule(self, _now: datetime) -> None:
+        """Run the scheduled bulk reconcile and arm the next one."""
+        self._unsub_reconcile = None
+        await self.async_refresh()
+        self._async_adapt_reconcile_interval()
+        self.async_schedule_reconcile()
+
+    @callback
+    def _async_adapt_reconcile_interval(self) -> None:
+        """Stretch or tighten `reconcile_interval` from the last reconcile.
+
+        While the WS pump runs without reconnects and reconciles keep
+        finding nothing the WS had not already delivered, the interval
+        doubles up to RECONCILE_MAX_INTERVAL_MINUTES. A reconnect, drift, a
+        failed reconcile or a stopped pump drops it back to at most
+        RECONCILE_INTERVAL_MINUTES and halves it on repeats, down to
+        RECONCILE_MIN_INTERVAL_MINUTES.
+        """
+        healthy = (
+            self.ws_running
+            and self.last_update_success
+            and not self.last_reconcile_drifted
+            and not self._reconnected_since_reconcile
+        )
+        self._reconnected_since_reconcile = False
+        if healthy:
+            interval = min(
+                self.reconcile_interval * 2,
+                timedelta(minutes=RECONCILE_MAX_INTERVAL_MINUTES),
+            )
+        else:
+            interval = max(
+                min(
+                    self.reconcile_interval / 2,
+                    timedelta(minutes=RECONCILE_INTERVAL_MINUTES),
+                ),
+                timedelta(minutes=RECONCILE_MIN_INTERVAL_MINUTES),
+            )
+        if interval != self.reconcile_interval:
+            _LOGGER.debug(
+                "Reconcile interval %s -> %s (ws healthy and no drift: %s)",
+                self.reconcile_interval,
+                interval,
+                healthy,
+            )
+        self.reconcile_interval = interval
+
+    @callback
+    def _async_unsub_reconcile(self) -> None:
+        """Cancel the scheduled reconcile, if any."""
+        if self._unsub_reconcile is not None:
+            self._unsub_reconcile()
+            self._unsub_reconcile = None
+
+    @callback
+    def async_add_unit_listener(
+        self, unit_id: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for updates of a single unit.
+
+        Unit listeners are woken by WS pushes for that unit only; the bulk
+        reconcile keeps going through the regular coordinator listeners.
+        """
+        listeners = self._unit_listeners.setdefault(unit_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the unit listener."""
+            listeners.remove(update_callback)
+            if not listeners:
+                self._unit_listeners.pop(unit_id, None)
+
+        return remove_listener
+
+    @callback
+    def async_update_unit_listeners(self, unit_id: str) -> None:
+        """Notify only the listeners registered for `unit_id`."""
+        for update_callback in list(self._unit_listeners.get(unit_id, ())):
+            update_callback()
+
+    @callback
+    def async_handle_unit_update(self, message: UnitUpdateMessage) -> None:
+        """Apply a WS `UnitUpdateMessage`, coalescing bursts per unit.
+
+        The server often sends several `UPDATE_UNIT` messages for one unit
+        within milliseconds. Each message carries the unit's full state, so
+        within the window only the latest one per unit is kept and applied,
+        giving a single state write per touched unit.
+
+        Messages that would not change the unit's rendered state (echoes of
+        our own commands, server re-broadcasts, reconnect replays) are
+        dropped and counted in `suppressed_updates`.
+        """
+        received = self.hass.loop.time()
+        self._recent_ws_events.append(received)
+        self._async_prune_ws_events()
+        if message.unit_id not in self._units_by_id:
+            # Unit appeared after setup; the next reconcile picks it up.
+            return
+        fingerprint = _message_fingerprint(message)
+        if fingerprint == self._fingerprints.get(message.unit_id):
+            self.suppressed_updates += 1
+            # Still an echo of the state we hold, e.g. of our own command.
+            self._async_resolve_expectations(message)
+            return
+        self._fingerprints[message.unit_id] = fingerprint
+        # A coalesced burst is as late as its first message.
+        self._received_at.setdefault(message.unit_id, received)
+        if not self.coalesce_window:
+            self._async_apply_unit_update(message)
+            return
+        self._pending_updates[message.unit_id] = message
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, self.coalesce_window, self._async_flush_unit_updates
+            )
+
+    @callback
+    def _async_flush_unit_updates(self, _now=None) -> None:
+        """Apply every update buffered during the coalescing window."""
+        self._unsub_flush = None
+        pending, self._pending_updates = self._pending_updates, {}
+        for message in pending.values():
+            self._async_apply_unit_update(message)
+
+    @callback
+    def _async_apply_unit_update(self, message: UnitUpdateMessage) -> None:
+        """Mutate the in-memory unit and wake its entities.
+
+        Entities write their state from the listener callback, so once the
+        listeners return the update has reached the state machine; that is
+        when a WS update's receive-to-write latency is taken.
+        """
+        received = self._received_at.pop(message.unit_id, None)
+        start = self.hass.loop.time()
+        self._units_by_id[message.unit_id]._update_unit(message)
+        self.latency[LATENCY_APPLY].add(self.hass.loop.time() - start)
+        self.async_update_unit_listeners(message.unit_id)
+        if received is not None and message.unit_id in self._unit_listeners:
+            self.latency[LATENCY_RECEIVE_TO_WRITE].add(
+                self.hass.loop.time() - received
+            )
+        self._async_resolve_expectations(message)
+
+    @callback
+    def async_expect_unit_update(
+        self, unit_id: str, predicate: Callable[[UnitUpdateMessage], bool]
+    ) -> asyncio.Future[None]:
+        """Return a future resolved once `unit_id` reaches a matching state.
+
+        The future completes when an update for the unit satisfying
+        `predicate` has been applied, or turns out to match the state
+        already held. Register it before sending a command so an echo
+        arriving during the HTTP round trip is not missed; cancel it (or
+        let a timeout cancel it) to stop waiting.
+        """
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        expectation = (predicate, future)
+        expectations = self._expectations.setdefault(unit_id, [])
+        expectations.append(expectation)
+
+        def _remove(_: asyncio.Future[None]) -> None:
+            expectations.remove(expectation)
+            if not expectations:
+                self._expectations.pop(unit_id, None)
+
+        future.add_done_callback(_remove)
+        return future
+
+    @callback
+    def _async_resolve_expectations(self, message: UnitUpdateMessage) -> None:
+        """Complete the expectations `message` satisfies."""
+        for predicate, future in list(self._expectations.get(message.unit_id, ())):
+            if not future.done() and predicate(message):
+                future.set_result(None)
+
+    async def async_send_command(
+        self, unit_id: str, field: str, command: Callable[[], Awaitable[None]]
+    ) -> bool:
+        """Send a command changing `field` of `unit_id` through the queue.
+
+        Returns False if a newer command for the same unit and field
+        superseded it before it was sent.
+        """
+
+        async def _async_send() -> None:
+            self.async_record_request("command")
+            start = self.hass.loop.time()
+            await command()
+            self.latency[LATENCY_COMMAND].add(self.hass.loop.time() - start)
+
+        return await self.command_queue.async_submit((unit_id, field), _async_send)
+
+    async def async_refresh_unit(self, unit_id: str) -> UnitUpdateMessage | None:
+        """Fetch one unit over HTTP and apply it, off the reconcile schedule.
+
+        Used when a command was not confirmed over the WS. Requests made
+        within REFRESH_BATCH_WINDOW of each other share one round trip: a
+        lone unit is fetched on its own, several units with a single bulk
+        request. Either way only the requested units are applied and woken;
+        this is not a reconcile. Returns the fetched message, or None if
+        the request failed.
+        """
+        future: asyncio.Future[UnitUpdateMessage | None]
+        future = self.hass.loop.create_future()
+        if self._refresh_waiters:
+            self.coalesced_refreshes += 1
+        self._refresh_waiters.setdefault(unit_id, []).append(future)
+        if self._unsub_refresh_batch is None:
+            self._unsub_refresh_batch = async_call_later(
+                self.hass, REFRESH_BATCH_WINDOW, self._async_run_refresh_batch
+            )
+        return await future
+
+    async def _async_run_refresh_batch(self, _now: datetime) -> None:
+        """Serve every unit refresh requested during the batching window."""
+        self._unsub_refresh_batch = None
+        batch, self._refresh_waiters = self._refresh_waiters, {}
+        if len(batch) == 1:
+            [unit_id] = batch
+            self.async_record_request("refresh")
+            message = await self._async_fetch_unit(unit_id)
+            messages = {} if message is None else {unit_id: message}
+        else:
+            try:
+                messages = await self._async_fetch_units("refresh")
+            except UpdateFailed as error:
+                _LOGGER.warning("Failed to refresh %s units: %s", len(batch), error)
+                messages = {}
+            messages = {
+                unit_id: messages[unit_id] for unit_id in batch if unit_id in messages
+            }
+            for message in messages.values():
+                self._async_apply_refreshed_unit(message)
+        for unit_id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(messages.get(unit_id))
+
+    async def _async_fetch_unit(self, unit_id: str) -> UnitUpdateMessage | None:
+        """Fetch and apply a single unit; None if the request failed."""
+        try:
+            message = await self._client.get_updated_controllable_unit(unit_id)
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to refresh unit %s: %s", unit_id, error)
+            return None
+        self._async_apply_refreshed_unit(message)
+        return message
+
+    @callback
+    def _async_apply_refreshed_unit(self, message: UnitUpdateMessage) -> None:
+        """Apply a unit fetched over HTTP in place of any buffered WS update."""
+        # Fresher than anything still buffered for this unit.
+        self._pending_updates.pop(message.unit_id, None)
+        self._fingerprints[message.unit_id] = _message_fingerprint(message)
+        self._async_apply_unit_update(message)
+
+    async def async_shutdown(self) -> None:
+        """Drop buffered WS updates along with any scheduled refresh."""
+        await super().async_shutdown()
+        self._reconcile_stopped = True
+        self._async_unsub_reconcile()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending_updates.clear()
+        self._received_at.clear()
+        if self._unsub_refresh_batch is not None:
+            self._unsub_refresh_batch()
+            self._unsub_refresh_batch = None
+        for futures in self._refresh_waiters.values():
+            for future in futures:
+                future.cancel()
+        self._refresh_waiters.clear()
+        self.command_queue.async_shutdown()
+
     @property
     def client(self):
         return self._client
@@ -0,0 +1,98 @@
+"""Diagnostics support for CoolAutomation Cloud Open Integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_WS_HUB, DOMAIN
+from .coordinator import CoolAutomationDataUpdateCoordinator
+from .ws_hub import WsHub
+
+TO_REDACT = {"username", "password", "token", "id"}
+
+
+def _coordinator_diagnostics(
+    coordinator: CoolAutomationDataUpdateCoordinator,
+) -> dict[str, Any]:
+    """Return what one coordinator reconciles, corrected and requested."""
+    return {
+        "reconcile": {
+            "interval_seconds": coordinator.reconcile_interval.total_seconds(),
+            "last_reconcile": coordinator.last_reconcile,
+            "last_duration_seconds": coordinator.last_reconcile_duration,
+            "last_reconcile_drifted": coordinator.last_reconcile_drifted,
+            "last_update_success": coordinator.last_update_success,
+        },
+        "drift": {
+            "last_drift": coordinator.last_drift,
+            "by_field": dict(coordinator.drift_by_field),
+            "by_unit": {
+                unit_id: dict(fields)
+                for unit_id, fields in coordinator.drift_counts.items()
+            },
+        },
+        "requests": {
+            "counts": dict(coordinator.request_counts),
+            "since": coordinator.request_counts_since,
+            "per_day": round(coordinator.requests_per_day, 1),
+            "coalesced_refreshes": coordinator.coalesced_refreshes,
+        },
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    A sharded entry reports reconcile, drift and requests per controller
+    under "shards"; the WS connection, latency and command queue are
+    shared by the shards and reported once.
+    """
+    coordinators: list[CoolAutomationDataUpdateCoordinator] = hass.data[DOMAIN][
+        entry.entry_id
+    ]
+    coordinator = coordinators[0]
+    ws_hub: WsHub | None = hass.data[DOMAIN].get(DATA_WS_HUB)
+    subscription = None if ws_hub is None else ws_hub.async_get_subscription(coordinator)
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "units": sum(len(shard.units) for shard in coordinators),
+        "ws": {
+            "running": coordinator.ws_running,
+            "state": None if subscription is None else subscription.state,
+            "restarts": None if subscription is None else subscription.restarts,
+            # Every shard sees each reconnect of the shared connection.
+            "reconnects": coordinator.ws_reconnects,
+            "events_per_minute": sum(
+                shard.ws_events_per_minute for shard in coordinators
+            ),
+            "suppressed_updates": sum(
+                shard.suppressed_updates for shard in coordinators
+            ),
+        },
+        "latency": {
+            stage: histogram.as_dict()
+            for stage, histogram in coordinator.latency.items()
+        },
+        "commands": {
+            "queue_depth": coordinator.command_queue.depth,
+            "sent": coordinator.command_queue.sent,
+            "dropped": coordinator.command_queue.dropped,
+        },
+    }
+    if len(coordinators) == 1:
+        diagnostics.update(_coordinator_diagnostics(coordinator))
+    else:
+        diagnostics["shards"] = {
+            shard.shard: {"units": len(shard.units), **_coordinator_diagnostics(shard)}
+            for shard in coordinators
+        }
+    return diagnostics
@@ -20,6 +20,15 @@ class CoolAutomationBaseEntity(CoordinatorEntity[CoolAutomationDataUpdateCoordin
         self._device_id = device_id
         self._client = coordinator.client
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to bulk updates and to WS pushes for this unit."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_unit_listener(
+                self._device_id, self._handle_coordinator_update
+            )
+        )
+
     @property
     def unit_data(self) -> HVACUnit:
         return self.coordinator.data[self._device_id]
@@ -32,9 +41,8 @@ class CoolAutomationUnitBaseEntity(CoolAutomationBaseEntity):
 
     def __init__(self, coordinator: CoolAutomationDataUpdateCoordinator, device_id: str) -> None:
         super().__init__(coordinator, device_id)
-        self.__attr_device_info = DeviceInfo(
+        self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self.unit_data.id)},
             name=self.unit_data.name,
             manufacturer="CoolAutomations",
-            suggested_area=self.unit_data.name,
         )
@@ -0,0 +1,198 @@
+"""Sensors for CoolAutomation Cloud Open Integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from cool_open_client.unit import HVACUnit
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+from .coordinator import (
+    LATENCY_APPLY,
+    LATENCY_COMMAND,
+    LATENCY_RECEIVE_TO_WRITE,
+    CoolAutomationDataUpdateCoordinator,
+)
+from .entity import CoolAutomationUnitBaseEntity
+
+# How often the latency sensors publish the current percentiles.
+UPDATE_INTERVAL = timedelta(seconds=30)
+
+OPERATION_MODES = ["cool", "heat", "dry", "fan", "auto"]
+OPERATION_STATUSES = ["on", "off"]
+
+
+def _operation_mode(unit: HVACUnit) -> str | None:
+    """Return the unit's operation mode as an enum option, if it is one."""
+    mode = (unit.operation_mode or "").lower()
+    return mode if mode in OPERATION_MODES else None
+
+
+def _operation_status(unit: HVACUnit) -> str | None:
+    """Return the unit's operation status as an enum option, if it is one."""
+    status = (unit.operation_status or "").lower()
+    return status if status in OPERATION_STATUSES else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class CoolAutomationSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of one unit field."""
+
+    value_fn: Callable[[HVACUnit], Any]
+
+
+UNIT_SENSORS: tuple[CoolAutomationSensorEntityDescription, ...] = (
+    CoolAutomationSensorEntityDescription(
+        key="ambient_temperature",
+        translation_key="ambient_temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        value_fn=lambda unit: unit.ambient_temperature,
+    ),
+    CoolAutomationSensorEntityDescription(
+        key="operation_status",
+        translation_key="operation_status",
+        device_class=SensorDeviceClass.ENUM,
+        options=OPERATION_STATUSES,
+        value_fn=_operation_status,
+    ),
+    CoolAutomationSensorEntityDescription(
+        key="operation_mode",
+        translation_key="operation_mode",
+        device_class=SensorDeviceClass.ENUM,
+        options=OPERATION_MODES,
+        value_fn=_operation_mode,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the sensor entry."""
+    coordinators: list[CoolAutomationDataUpdateCoordinator] = hass.data[DOMAIN][
+        entry.entry_id
+    ]
+
+    async_add_entities(
+        CoolAutomationUnitSensor(coordinator, unit.id, description)
+        for coordinator in coordinators
+        for unit in coordinator.units
+        for description in UNIT_SENSORS
+    )
+    # Shards share their latency histograms; any of them reports the entry.
+    async_add_entities(
+        CoolAutomationLatencySensor(coordinators[0], entry, stage)
+        for stage in (
+            LATENCY_APPLY,
+            LATENCY_RECEIVE_TO_WRITE,
+            LATENCY_COMMAND,
+        )
+    )
+
+
+class CoolAutomationUnitSensor(CoolAutomationUnitBaseEntity, SensorEntity):
+    """One field of a unit, such as its ambient temperature.
+
+    The coordinator notifies every entity of a unit on each update; the
+    sensor only writes its state when its own field changed, so a setpoint
+    or fan change does not churn the temperature history and vice versa.
+    """
+
+    entity_description: CoolAutomationSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: CoolAutomationDataUpdateCoordinator,
+        unit_id: str,
+        description: CoolAutomationSensorEntityDescription,
+    ) -> None:
+        """Initialize the `description` sensor of unit `unit_id`."""
+        super().__init__(coordinator, unit_id)
+        self.entity_description = description
+        self._attr_unique_id = f"{unit_id}_{description.key}"
+        self._attr_native_value = description.value_fn(self.unit_data)
+        self._written_available = True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the field or the availability changed."""
+        value = self.entity_description.value_fn(self.unit_data)
+        available = self.available
+        if value == self._attr_native_value and available == self._written_available:
+            return
+        self._attr_native_value = value
+        self._written_available = available
+        self.async_write_ha_state()
+
+
+class CoolAutomationLatencySensor(SensorEntity):
+    """p95 of one latency stage, with p50/p99 as attributes.
+
+    Disabled by default. The histogram changes with every WS update, so the
+    sensor publishes it every UPDATE_INTERVAL instead of on each one. It
+    keeps its own timer rather than setting should_poll: the platform's
+    poll timer outlives an unload when every polled entity is disabled.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: CoolAutomationDataUpdateCoordinator,
+        entry: ConfigEntry,
+        stage: str,
+    ) -> None:
+        """Initialize the sensor of latency `stage`."""
+        self._histogram = coordinator.latency[stage]
+        self._attr_translation_key = f"{stage}_latency"
+        self._attr_unique_id = f"{entry.entry_id}_{stage}_latency"
+
+    async def async_added_to_hass(self) -> None:
+        """Start publishing the percentiles."""
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_publish, UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_publish(self, _now: datetime) -> None:
+        """Write the current percentiles to the state machine."""
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the p95 latency in milliseconds."""
+        return self._histogram.as_dict()["p95_ms"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the sample count and the other percentiles."""
+        summary = self._histogram.as_dict()
+        return {
+            "count": summary["count"],
+            "p50": summary["p50_ms"],
+            "p99": summary["p99_ms"],
+        }
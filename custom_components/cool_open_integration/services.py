@@ -0,0 +1,242 @@
+"""Services for the CoolAutomation Cloud Open Integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from cool_open_client.cool_automation_client import UnitUpdateMessage
+from cool_open_client.unit import HVACUnit
+
+from homeassistant.components.climate.const import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+    ATTR_SWING_MODE,
+    HVACMode,
+)
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .climate import HA_TO_OPEN_CLIENT_MODES
+from .const import (
+    COMMAND_CONFIRM_TIMEOUT,
+    DOMAIN,
+    SERVICE_SET_UNITS,
+    SET_UNITS_CONCURRENCY,
+)
+from .coordinator import CoolAutomationDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__package__)
+
+_TARGET_KEYS = (ATTR_HVAC_MODE, ATTR_TEMPERATURE, ATTR_FAN_MODE, ATTR_SWING_MODE)
+
+SET_UNITS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_HVAC_MODE): vol.Coerce(HVACMode),
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_FAN_MODE): cv.string,
+            vol.Optional(ATTR_SWING_MODE): cv.string,
+        }
+    ),
+    cv.has_at_least_one_key(*_TARGET_KEYS),
+)
+
+Predicate = Callable[[UnitUpdateMessage], bool]
+
+
+def _unit_commands(
+    unit: HVACUnit, target: dict[str, Any]
+) -> tuple[Predicate, list[tuple[str, Callable[[], Awaitable[None]]]]]:
+    """Return the (field, command) pairs bringing `unit` to `target`.
+
+    Also returns the predicate confirming the unit reached `target`.
+    Mirrors the validation of the climate entity's setters. Raises
+    ValueError when the unit cannot take the target state.
+    """
+    predicates: list[Predicate] = []
+    commands: list[tuple[str, Callable[[], Awaitable[None]]]] = []
+
+    if (hvac_mode := target.get(ATTR_HVAC_MODE)) == HVACMode.OFF:
+        predicates.append(lambda message: message.operation_status == "off")
+        commands.append(("operation_status", unit.turn_off))
+    elif hvac_mode is not None:
+        mode = HA_TO_OPEN_CLIENT_MODES.get(hvac_mode)
+        if mode is None or mode not in (unit.operation_modes or ()):
+            raise ValueError(f"Unsupported mode {hvac_mode}")
+        predicates.append(
+            lambda message: message.operation_mode == mode
+            and message.operation_status == "on"
+        )
+        # API has typo in method name: set_opration_mode (missing 'e')
+        commands.append(("operation_mode", lambda: unit.set_opration_mode(mode)))
+        if not unit.is_on:
+            commands.append(("operation_status", unit.turn_on))
+
+    if (temperature := target.get(ATTR_TEMPERATURE)) is not None:
+        rounded_temp = int(round(min(max(temperature, unit.min_temp), unit.max_temp)))
+        predicates.append(
+            lambda message: message.setpoint is not None
+            and round(message.setpoint) == rounded_temp
+        )
+        commands.append(
+            ("setpoint", lambda: unit.set_temperature_set_point(rounded_temp))
+        )
+
+    if (fan_mode := target.get(ATTR_FAN_MODE)) is not None:
+        fan = fan_mode.strip().upper()
+        if fan not in (unit.fan_modes or ()):
+            raise ValueError(f"Fan mode {fan_mode} is not valid")
+        predicates.append(lambda message: message.fan_mode == fan)
+        commands.append(("fan_mode", lambda: unit.set_fan_mode(fan)))
+
+    if (swing_mode := target.get(ATTR_SWING_MODE)) is not None:
+        swing = swing_mode.strip()
+        if swing not in (unit.swing_modes or ()):
+            raise ValueError(f"Swing mode {swing_mode} is not valid")
+        predicates.append(lambda message: message.swing == swing)
+        commands.append(("swing", lambda: unit.set_swing_mode(swing)))
+
+    return (lambda message: all(p(message) for p in predicates)), commands
+
+
+@callback
+def _async_resolve_unit(
+    hass: HomeAssistant, entity_id: str
+) -> tuple[CoolAutomationDataUpdateCoordinator, HVACUnit] | None:
+    """Return the coordinator and unit behind a climate `entity_id`."""
+    entity = er.async_get(hass).async_get(entity_id)
+    if (
+        entity is None
+        or entity.platform != DOMAIN
+        or entity.domain != Platform.CLIMATE
+        or entity.config_entry_id not in hass.data.get(DOMAIN, {})
+    ):
+        return None
+    coordinators: list[CoolAutomationDataUpdateCoordinator] = hass.data[DOMAIN][
+        entity.config_entry_id
+    ]
+    for coordinator in coordinators:
+        if (unit := coordinator.data.get(entity.unique_id)) is not None:
+            return coordinator, unit
+    return None
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def _async_set_units(call: ServiceCall) -> ServiceResponse:
+        """Bring many units to one target state with a single confirmation pass.
+
+        Commands are sent with at most SET_UNITS_CONCURRENCY units in flight;
+        the coordinator's command queue additionally caps the requests in
+        flight across the account at COMMAND_BURST.
+        The whole batch then waits once for WS confirmations; units still
+        unconfirmed are refreshed together, which the coordinator serves
+        with one bulk request.
+        """
+        target = {key: call.data[key] for key in _TARGET_KEYS if key in call.data}
+        semaphore = asyncio.Semaphore(SET_UNITS_CONCURRENCY)
+        results: dict[str, dict[str, Any]] = {}
+        sent: dict[
+            str,
+            tuple[
+                CoolAutomationDataUpdateCoordinator,
+                str,
+                Predicate,
+                asyncio.Future[None],
+            ],
+        ] = {}
+
+        async def _async_send(entity_id: str) -> None:
+            if (resolved := _async_resolve_unit(hass, entity_id)) is None:
+                results[entity_id] = {
+                    "success": False,
+                    "error": "Not a CoolAutomation unit",
+                }
+                return
+            coordinator, unit = resolved
+            try:
+                confirmed, commands = _unit_commands(unit, target)
+            except ValueError as error:
+                results[entity_id] = {"success": False, "error": str(error)}
+                return
+            # Expect before sending: the echo can beat the HTTP response.
+            expectation = coordinator.async_expect_unit_update(unit.id, confirmed)
+            try:
+                async with semaphore:
+                    for field, command in commands:
+                        if not await coordinator.async_send_command(
+                            unit.id, field, command
+                        ):
+                            expectation.cancel()
+                            results[entity_id] = {
+                                "success": False,
+                                "error": "Superseded by a newer command",
+                            }
+                            return
+            except Exception as error:  # pylint: disable=broad-except
+                expectation.cancel()
+                _LOGGER.error("Failed to set %s: %s", entity_id, error)
+                results[entity_id] = {"success": False, "error": str(error)}
+                return
+            sent[entity_id] = (coordinator, unit.id, confirmed, expectation)
+
+        entity_ids: list[str] = list(dict.fromkeys(call.data[ATTR_ENTITY_ID]))
+        await asyncio.gather(*(_async_send(entity_id) for entity_id in entity_ids))
+
+        if sent:
+            await asyncio.wait(
+                [expectation for *_, expectation in sent.values()],
+                timeout=COMMAND_CONFIRM_TIMEOUT,
+            )
+        unconfirmed = {
+            entity_id: item for entity_id, item in sent.items() if not item[3].done()
+        }
+        for entity_id in sent.keys() - unconfirmed.keys():
+            results[entity_id] = {"success": True}
+        if unconfirmed:
+            _LOGGER.debug("No WS confirmation for %s, refreshing", list(unconfirmed))
+            for *_, expectation in unconfirmed.values():
+                expectation.cancel()
+            messages = await asyncio.gather(
+                *(
+                    coordinator.async_refresh_unit(unit_id)
+                    for coordinator, unit_id, _, _ in unconfirmed.values()
+                )
+            )
+            for (entity_id, (_, _, confirmed, _)), message in zip(
+                unconfirmed.items(), messages
+            ):
+                if message is not None and confirmed(message):
+                    results[entity_id] = {"success": True}
+                else:
+                    _LOGGER.warning("%s did not apply %s", entity_id, target)
+                    results[entity_id] = {
+                        "success": False,
+                        "error": "Unit did not apply the requested state",
+                    }
+
+        if not call.return_response:
+            return None
+        return {"units": {entity_id: results[entity_id] for entity_id in entity_ids}}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_UNITS,
+        _async_set_units,
+        schema=SET_UNITS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
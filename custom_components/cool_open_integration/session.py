@@ -0,0 +1,44 @@
+"""Shared HTTP session and SSL context for cool-open-client."""
+from __future__ import annotations
+
+from ssl import SSLContext
+
+from cool_open_client.cool_automation_client import CoolAutomationClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.ssl import client_context
+
+from .const import DATA_SSL_CONTEXT
+
+
+async def async_get_ssl_context(hass: HomeAssistant) -> SSLContext:
+    """Return the SSL context for cool-open-client, building it only once.
+
+    Building reads the system CA bundle, so it runs in the executor the
+    first time and is kept in hass.data for every later entry and flow.
+    """
+    if (ssl_context := hass.data.get(DATA_SSL_CONTEXT)) is None:
+        ssl_context = await hass.async_add_executor_job(client_context)
+        hass.data[DATA_SSL_CONTEXT] = ssl_context
+    return ssl_context
+
+
+async def async_share_session(hass: HomeAssistant, ssl_context: SSLContext) -> None:
+    """Send the client's REST calls through Home Assistant's shared session.
+
+    CoolAutomationClient is a process-wide singleton whose REST layer lazily
+    opens a private aiohttp session on first use. Handing it HA's pooled
+    session before that reuses keep-alive connections across the client,
+    the units factory and the config flows. Nothing in the integration
+    closes the client's REST layer, which would close HA's session too.
+    """
+    rest_client = CoolAutomationClient(ssl_context=ssl_context).api_client.rest_client
+    session = async_get_clientsession(hass)
+    if rest_client.pool_manager is session:
+        return
+    if rest_client.pool_manager is not None:
+        await rest_client.pool_manager.close()
+    rest_client.pool_manager = session
+    # Any retry wrapper was bound to the previous session.
+    rest_client.retry_client = None
@@ -0,0 +1,41 @@
+"""Rolling latency statistics."""
+from __future__ import annotations
+
+from collections import deque
+import math
+
+from .const import LATENCY_WINDOW
+
+
+class RollingPercentiles:
+    """Percentiles over the last `size` samples, in seconds."""
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        """Initialize an empty window of `size` samples."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Add a sample, evicting the oldest once the window is full."""
+        self._samples.append(value)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest-rank `percent` percentile, or None if empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return the sample count and p50/p95/p99 in milliseconds."""
+        summary: dict[str, float | int | None] = {"count": len(self._samples)}
+        for percent in (50, 95, 99):
+            value = self.percentile(percent)
+            summary[f"p{percent}_ms"] = (
+                None if value is None else round(value * 1000, 1)
+            )
+        return summary
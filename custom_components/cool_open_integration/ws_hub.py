@@ -0,0 +1,223 @@
+"""WebSocket connections shared by the coordinators of one token."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING, Any
+
+from cool_open_client.cool_automation_client import (
+    CoolAutomationClient,
+    UnitUpdateMessage,
+)
+from cool_open_client.ws_events import Reconnected, UnitUpdate
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    WS_RESTART_BASE_DELAY,
+    WS_RESTART_MAX_DELAY,
+    WS_RESTART_RESET_SECONDS,
+)
+from .coordinator import CoolAutomationDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from .ws_recording import WsRecorder
+
+_LOGGER = logging.getLogger(__package__)
+
+
+async def _ws_pump(
+    coordinator: CoolAutomationDataUpdateCoordinator | WsSubscription,
+) -> None:
+    """Forever-loop consumer of the library's WS event stream.
+
+    Hands each `UnitUpdate` to the coordinator, which coalesces bursts and
+    wakes only the entities of that unit, and triggers a bulk reconcile on
+    each `Reconnected`. A `WsSubscription` can stand in for the coordinator
+    to fan the stream out to several coordinators. Events are also handed to the
+    target's `ws_recorder` when recording is on. Cancellation propagates so
+    HA can stop us cleanly during entry unload.
+    """
+    client = coordinator.client
+
+    coordinator.async_set_ws_running(True)
+    try:
+        async for event in client.subscribe_unit_updates():
+            if (recorder := coordinator.ws_recorder) is not None:
+                recorder.async_record(event)
+            if isinstance(event, UnitUpdate):
+                coordinator.async_handle_unit_update(event.message)
+            elif isinstance(event, Reconnected):
+                await coordinator.async_handle_reconnected()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        _LOGGER.exception("WS pump terminated unexpectedly")
+    finally:
+        coordinator.async_set_ws_running(False)
+
+
+async def _async_supervise(subscription: WsSubscription) -> None:
+    """Run the pump of `subscription`, restarting it whenever it stops.
+
+    Restarts back off exponentially from WS_RESTART_BASE_DELAY up to
+    WS_RESTART_MAX_DELAY, with jitter so several pumps failing together do
+    not reconnect in lockstep. Meanwhile the coordinators, told the pump is
+    down, reconcile on their tightest interval.
+    """
+    loop = asyncio.get_running_loop()
+    failures = 0
+    while True:
+        subscription.state = "running"
+        started = loop.time()
+        await _ws_pump(subscription)
+        if loop.time() - started >= WS_RESTART_RESET_SECONDS:
+            failures = 0
+        delay = min(WS_RESTART_BASE_DELAY * 2**failures, WS_RESTART_MAX_DELAY)
+        delay *= random.uniform(0.5, 1)
+        failures += 1
+        subscription.restarts += 1
+        subscription.state = "restarting"
+        _LOGGER.warning("WS pump stopped; restarting in %.0f s", delay)
+        await asyncio.sleep(delay)
+
+
+class _TokenClient:
+    """The client, opening its WS with a token of its own.
+
+    CoolAutomationClient is a process-wide singleton holding the token of
+    the entry set up last; a socket opened straight through it would
+    authenticate as that entry whichever entry it serves.
+    """
+
+    def __init__(self, client: CoolAutomationClient, token: str) -> None:
+        self._client = client
+        self.token = token
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def subscribe_unit_updates(self) -> Any:
+        # The library reads the token off the instance at each (re)connect.
+        return type(self._client).subscribe_unit_updates(self)
+
+
+class WsSubscription:
+    """One WS connection routing its events to the coordinators using it."""
+
+    def __init__(self, client: CoolAutomationClient, token: str) -> None:
+        """Initialize a subscription reading from `client` as `token`."""
+        self.client = _TokenClient(client, token)
+        self.coordinators: list[CoolAutomationDataUpdateCoordinator] = []
+        self._coordinators_by_unit: dict[
+            str, list[CoolAutomationDataUpdateCoordinator]
+        ] = {}
+        self.running = False
+        # Supervisor view of the pump: "running" or "restarting".
+        self.state = "running"
+        self.restarts = 0
+        self.task: asyncio.Task[None] | None = None
+
+    @property
+    def ws_recorder(self) -> WsRecorder | None:
+        """Return the recorder of the first coordinator recording, if any."""
+        for coordinator in self.coordinators:
+            if coordinator.ws_recorder is not None:
+                return coordinator.ws_recorder
+        return None
+
+    @callback
+    def async_add(self, coordinator: CoolAutomationDataUpdateCoordinator) -> None:
+        """Route the units of `coordinator` to it."""
+        self.coordinators.append(coordinator)
+        for unit in coordinator.units:
+            self._coordinators_by_unit.setdefault(unit.id, []).append(coordinator)
+        coordinator.async_set_ws_running(self.running)
+
+    @callback
+    def async_remove(self, coordinator: CoolAutomationDataUpdateCoordinator) -> None:
+        """Stop routing to `coordinator`."""
+        self.coordinators.remove(coordinator)
+        for unit in coordinator.units:
+            owners = self._coordinators_by_unit[unit.id]
+            owners.remove(coordinator)
+            if not owners:
+                del self._coordinators_by_unit[unit.id]
+        coordinator.async_set_ws_running(False)
+
+    @callback
+    def async_set_ws_running(self, running: bool) -> None:
+        """Tell every coordinator whether the shared pump is running."""
+        self.running = running
+        for coordinator in self.coordinators:
+            coordinator.async_set_ws_running(running)
+
+    @callback
+    def async_handle_unit_update(self, message: UnitUpdateMessage) -> None:
+        """Hand `message` to every coordinator holding its unit."""
+        for coordinator in self._coordinators_by_unit.get(message.unit_id, ()):
+            coordinator.async_handle_unit_update(message)
+
+    async def async_handle_reconnected(self) -> None:
+        """Let every coordinator reconcile what the outage may have hidden."""
+        await asyncio.gather(
+            *(coordinator.async_handle_reconnected() for coordinator in self.coordinators)
+        )
+
+
+class WsHub:
+    """Keeps one WS connection per token across coordinators.
+
+    Coordinators subscribing with the same token share the connection,
+    which authenticates with that token; it is opened by the first
+    subscriber and closed when the last one unsubscribes. The shards of an
+    entry share a connection this way. So would entries holding the same
+    token, but the config flow allows one entry per user, so in practice
+    each entry has a connection of its own.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.subscriptions: dict[str, WsSubscription] = {}
+
+    @callback
+    def async_get_subscription(
+        self, coordinator: CoolAutomationDataUpdateCoordinator
+    ) -> WsSubscription | None:
+        """Return the subscription feeding `coordinator`, if any."""
+        for subscription in self.subscriptions.values():
+            if coordinator in subscription.coordinators:
+                return subscription
+        return None
+
+    @callback
+    def async_subscribe(
+        self, token: str, coordinator: CoolAutomationDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Feed `coordinator` from the connection authenticated as `token`.
+
+        Returns a callback that unsubscribes it again.
+        """
+        if (subscription := self.subscriptions.get(token)) is None:
+            subscription = self.subscriptions[token] = WsSubscription(
+                coordinator.client, token
+            )
+            subscription.task = self.hass.async_create_background_task(
+                _async_supervise(subscription), name=f"{DOMAIN}_ws_pump"
+            )
+        subscription.async_add(coordinator)
+
+        @callback
+        def unsubscribe() -> None:
+            """Unsubscribe the coordinator, closing the connection if unused."""
+            subscription.async_remove(coordinator)
+            if subscription.coordinators:
+                return
+            del self.subscriptions[token]
+            if subscription.task is not None:
+                subscription.task.cancel()
+
+        return unsubscribe
@@ -0,0 +1,191 @@
+"""Record WS traffic to disk and replay it through the pump."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from datetime import datetime
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from cool_open_client.cool_automation_client import UnitUpdateMessage
+from cool_open_client.ws_events import Reconnected, UnitUpdate, WsEvent
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import WS_RECORD_BACKUPS, WS_RECORD_FLUSH_INTERVAL, WS_RECORD_MAX_BYTES
+from .coordinator import CoolAutomationDataUpdateCoordinator
+from .ws_hub import _ws_pump
+
+_LOGGER = logging.getLogger(__package__)
+
+_UNIT_UPDATE = "unit_update"
+_RECONNECTED = "reconnected"
+
+
+def _encode(timestamp: float, event: WsEvent) -> str | None:
+    """Return the NDJSON line of `event`, or None if it is not recorded."""
+    if isinstance(event, UnitUpdate):
+        record: dict[str, Any] = {
+            "ts": timestamp,
+            "event": _UNIT_UPDATE,
+            "message": asdict(event.message),
+        }
+    elif isinstance(event, Reconnected):
+        record = {"ts": timestamp, "event": _RECONNECTED}
+    else:
+        return None
+    return json.dumps(record, separators=(",", ":"))
+
+
+def _decode(line: str) -> tuple[float, WsEvent]:
+    """Return the timestamp and event recorded on `line`."""
+    record = json.loads(line)
+    if record["event"] == _UNIT_UPDATE:
+        return record["ts"], UnitUpdate(UnitUpdateMessage(**record["message"]))
+    return record["ts"], Reconnected()
+
+
+def read_recording(path: str | os.PathLike[str]) -> list[tuple[float, WsEvent]]:
+    """Return the timestamped events of a recording, oldest first.
+
+    Blocking; run it in the executor from the event loop.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [_decode(line) for line in file if line.strip()]
+
+
+class WsRecorder:
+    """Appends WS events to a rotating gzip file of newline-delimited JSON.
+
+    Each line holds the wall-clock receive time and the event, with a
+    `UnitUpdate` stored as the message the library produced. Lines are
+    buffered and written every WS_RECORD_FLUSH_INTERVAL seconds in the
+    executor; once the file exceeds WS_RECORD_MAX_BYTES it is rotated to
+    `.1`, keeping WS_RECORD_BACKUPS older files.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str | os.PathLike[str]) -> None:
+        """Initialize a recorder writing to `path`."""
+        self.hass = hass
+        self.path = Path(path)
+        self._lines: list[str] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._flush_lock = asyncio.Lock()
+
+    @callback
+    def async_record(self, event: WsEvent) -> None:
+        """Buffer `event` for the next flush."""
+        if (line := _encode(time.time(), event)) is None:
+            return
+        self._lines.append(line)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, WS_RECORD_FLUSH_INTERVAL, self._async_flush_on_schedule
+            )
+
+    async def _async_flush_on_schedule(self, _now: datetime) -> None:
+        """Write the buffered events."""
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write the buffered events now."""
+        async with self._flush_lock:
+            lines, self._lines = self._lines, []
+            if lines:
+                await self.hass.async_add_executor_job(self._write, lines)
+
+    async def async_close(self) -> None:
+        """Stop the flush timer and write what is still buffered."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+
+    def _write(self, lines: list[str]) -> None:
+        """Append `lines` to the recording, rotating it first if it is full."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size >= WS_RECORD_MAX_BYTES:
+            self._rotate()
+        # Appending adds a gzip member; readers see one continuous stream.
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write("".join(f"{line}\n" for line in lines))
+
+    def _rotate(self) -> None:
+        """Shift the recording and its backups one place, dropping the oldest."""
+        for index in range(WS_RECORD_BACKUPS, 0, -1):
+            source = self.path.with_name(
+                self.path.name if index == 1 else f"{self.path.name}.{index - 1}"
+            )
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index}"))
+
+
+class _ReplayClient:
+    """Stands in for the client, streaming recorded events instead of the WS."""
+
+    def __init__(self, events: list[tuple[float, WsEvent]], speed: float) -> None:
+        self._events = events
+        self._speed = speed
+
+    async def subscribe_unit_updates(self) -> AsyncIterator[WsEvent]:
+        """Yield the recorded events, spaced as recorded divided by speed."""
+        previous = self._events[0][0] if self._events else 0
+        for timestamp, event in self._events:
+            if self._speed:
+                await asyncio.sleep((timestamp - previous) / self._speed)
+            previous = timestamp
+            yield event
+
+
+class _ReplayTarget:
+    """Pump target feeding a coordinator from a recording.
+
+    The coordinator may be live: the replay leaves the state of its real
+    WS pump alone.
+    """
+
+    ws_recorder = None
+
+    def __init__(
+        self,
+        coordinator: CoolAutomationDataUpdateCoordinator,
+        client: _ReplayClient,
+    ) -> None:
+        self.client = client
+        self._coordinator = coordinator
+
+    @callback
+    def async_set_ws_running(self, running: bool) -> None:
+        """Ignore the replay starting and stopping."""
+
+    @callback
+    def async_handle_unit_update(self, message: UnitUpdateMessage) -> None:
+        self._coordinator.async_handle_unit_update(message)
+
+    async def async_handle_reconnected(self) -> None:
+        await self._coordinator.async_handle_reconnected()
+
+
+async def async_replay(
+    coordinator: CoolAutomationDataUpdateCoordinator,
+    path: str | os.PathLike[str],
+    speed: float = 1.0,
+) -> int:
+    """Feed a recording through the WS pump into `coordinator`.
+
+    `speed` scales the recorded gaps between events: 1 replays in real
+    time, 10 ten times faster and 0 as fast as the pump takes them.
+    Returns the number of events replayed.
+    """
+    events = await coordinator.hass.async_add_executor_job(read_recording, path)
+    await _ws_pump(_ReplayTarget(coordinator, _ReplayClient(events, speed)))
+    _LOGGER.debug("Replayed %s WS events from %s", len(events), path)
+    return len(events)
@@ -0,0 +1,150 @@
+"""A local stand-in for the CoolAutomation REST API and WS stream."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+DICTIONARIES = {
+    "temperatureScale": {"1": "celsius"},
+    "operationStatuses": {"1": "on", "2": "off"},
+    "operationModes": {"0": "COOL", "1": "HEAT", "2": "AUTO", "3": "DRY", "4": "FAN"},
+    "fanModes": {"0": "LOW", "1": "MEDIUM", "2": "HIGH", "3": "AUTO"},
+    "swingModes": {"0": "vertical", "1": "30", "2": "45", "3": "60", "4": "horizontal", "5": "auto"},
+}
+
+# Unit control endpoints and the unit field each of them sets.
+_CONTROLS = {
+    "operation-statuses": ("operationStatus", "activeOperationStatus"),
+    "operation-modes": ("operationMode", "activeOperationMode"),
+    "setpoints": ("setpoint", "activeSetpoint"),
+    "fan-modes": ("fanMode", "activeFanMode"),
+    "swing-modes": ("swingMode", "activeSwingMode"),
+}
+
+
+def _unit(index: int, unit_id: str | None = None) -> dict[str, Any]:
+    """Return the REST representation of unit number `index`."""
+    return {
+        "id": unit_id or f"unit-{index}",
+        "name": f"Unit {index}",
+        "type": 1,
+        "isConnected": True,
+        "supportedOperationStatuses": [1, 2],
+        "supportedOperationModes": [0, 1, 2, 3, 4],
+        "supportedFanModes": [0, 1, 2, 3],
+        "supportedSwingModes": [0, 1, 2, 3, 4, 5],
+        "temperatureLimits": {"0": [16, 30], "1": [16, 30]},
+        "activeSetpoint": 24,
+        "ambientTemperature": 26,
+        "activeOperationStatus": 1,
+        "activeOperationMode": 0,
+        "activeFanMode": 0,
+        "activeSwingMode": 5,
+        "isHalfCDegreeEnabled": False,
+    }
+
+
+class FakeCoolAutomationCloud:
+    """Serves `unit_count` units over REST and pushes UPDATE_UNIT over WS.
+
+    Commands apply to the served units and are echoed on the WS, like the
+    real service does.
+    """
+
+    def __init__(self, unit_count: int, unit_ids: list[str] | None = None) -> None:
+        """Initialize the cloud with `unit_count` units, or `unit_ids`."""
+        if unit_ids is None:
+            unit_ids = [f"unit-{index}" for index in range(unit_count)]
+        self.units = {
+            unit_id: _unit(index, unit_id) for index, unit_id in enumerate(unit_ids)
+        }
+        self.requests = 0
+        self.connected = asyncio.Event()
+        self._sockets: list[web.WebSocketResponse] = []
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    @property
+    def rest_url(self) -> str:
+        """Return the base URL of the REST API."""
+        return f"{self.url}/api/v2"
+
+    @property
+    def ws_url(self) -> str:
+        """Return the URL of the WS stream."""
+        return f"{self.url.replace('http', 'ws', 1)}/ws/v2"
+
+    async def async_start(self) -> None:
+        """Listen on an ephemeral localhost port."""
+        app = web.Application()
+        app.router.add_get("/api/v2/services/types", self._types)
+        app.router.add_get("/api/v2/units", self._units)
+        app.router.add_get("/api/v2/units/{unit_id}", self._unit)
+        app.router.add_put("/api/v2/units/{unit_id}/controls/{control}", self._control)
+        app.router.add_get("/ws/v2", self._ws)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def async_stop(self) -> None:
+        """Close every WS and stop listening."""
+        for socket in list(self._sockets):
+            await socket.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def async_push(self, unit_id: str, **changes: Any) -> None:
+        """Apply `changes` (REST field names) to a unit and push it over WS."""
+        unit = self.units[unit_id]
+        unit.update(changes)
+        message = {
+            "name": "UPDATE_UNIT",
+            "data": {
+                "unitId": unit_id,
+                "fan": unit["activeFanMode"],
+                "operationMode": unit["activeOperationMode"],
+                "operationStatus": unit["activeOperationStatus"],
+                "setpoint": unit["activeSetpoint"],
+                "swing": unit["activeSwingMode"],
+                "ambientTemperature": unit["ambientTemperature"],
+            },
+        }
+        for socket in self._sockets:
+            await socket.send_json(message)
+
+    def _response(self, data: Any) -> web.Response:
+        self.requests += 1
+        return web.json_response({"success": True, "data": data})
+
+    async def _types(self, request: web.Request) -> web.Response:
+        return self._response(DICTIONARIES)
+
+    async def _units(self, request: web.Request) -> web.Response:
+        return self._response(self.units)
+
+    async def _unit(self, request: web.Request) -> web.Response:
+        return self._response(self.units[request.match_info["unit_id"]])
+
+    async def _control(self, request: web.Request) -> web.Response:
+        unit_id = request.match_info["unit_id"]
+        body_field, unit_field = _CONTROLS[request.match_info["control"]]
+        value = (await request.json())[body_field]
+        response = self._response({})
+        await self.async_push(unit_id, **{unit_field: value})
+        return response
+
+    async def _ws(self, request: web.Request) -> web.WebSocketResponse:
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        async for message in socket:
+            if message.type is WSMsgType.TEXT and message.json()["type"] == "authenticate":
+                self._sockets.append(socket)
+                self.connected.set()
+        if socket in self._sockets:
+            self._sockets.remove(socket)
+        return socket
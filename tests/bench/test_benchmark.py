@@ -0,0 +1,212 @@
+"""Throughput and latency baseline against a local fake cloud.
+
+Drives the real setup, WS pump and climate entities against
+`FakeCoolAutomationCloud` and prints one line of figures per site size.
+Skipped unless COOL_OPEN_BENCH is set:
+
+    COOL_OPEN_BENCH=1 python -m pytest tests/bench -s -p no:sugar
+
+`test_replay` feeds a WS recording (see `ws_recording`) through the same
+setup, serving the recorded units from the fake cloud, to profile a
+site's real bursts offline. COOL_OPEN_REPLAY_SPEED scales the recorded
+gaps; 0, the default, replays as fast as the pump takes the events:
+
+    COOL_OPEN_REPLAY=ws-<entry id>.ndjson.gz python -m pytest tests/bench -s -p no:sugar
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from cool_open_client.cool_automation_client import CoolAutomationClient
+from cool_open_client.utils.singleton import SingletonMeta
+from cool_open_client.ws_events import UnitUpdate
+
+from homeassistant.components.climate import (
+    ATTR_TEMPERATURE,
+    DOMAIN as CLIMATE_DOMAIN,
+    SERVICE_SET_TEMPERATURE,
+)
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_STATE_CHANGED
+from homeassistant.core import callback
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cool_open_integration.const import DOMAIN
+from custom_components.cool_open_integration.ws_recording import (
+    async_replay,
+    read_recording,
+)
+
+from .fake_cloud import FakeCoolAutomationCloud
+
+# Events pushed per unit during the throughput run.
+EVENTS_PER_UNIT = 5
+# Commands sent through climate entities; the command queue rate limits them.
+COMMANDS = 10
+
+
+def _rss_kib() -> int | None:
+    """Return the resident set size of this process, where /proc has it."""
+    statm = Path("/proc/self/statm")
+    if not statm.exists():
+        return None
+    return int(statm.read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+async def _async_wait_for(condition, timeout: float = 120) -> None:
+    """Wait until `condition()` holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+def _entry(hass, cloud: FakeCoolAutomationCloud) -> MockConfigEntry:
+    """Return an entry whose client talks to `cloud`."""
+    # Built before setup so CoolAutomationClient.create() reuses it.
+    CoolAutomationClient().api_client.configuration.host = cloud.rest_url
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={"username": "u", "password": "p", "token": "t"}
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def client_singleton():
+    """Give each run a fresh CoolAutomationClient singleton."""
+    SingletonMeta._instances.pop(CoolAutomationClient, None)
+    yield
+    SingletonMeta._instances.pop(CoolAutomationClient, None)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("COOL_OPEN_BENCH"), reason="set COOL_OPEN_BENCH to run"
+)
+@pytest.mark.parametrize("unit_count", [10, 100, 1000])
+async def test_benchmark(hass, client_singleton, socket_enabled, unit_count):
+    cloud = FakeCoolAutomationCloud(unit_count)
+    await cloud.async_start()
+    entry = _entry(hass, cloud)
+    writes = 0
+
+    @callback
+    def _count_write(event) -> None:
+        nonlocal writes
+        if event.data["entity_id"].startswith(f"{CLIMATE_DOMAIN}."):
+            writes += 1
+
+    with patch.object(CoolAutomationClient, "SOCKET_URI", cloud.ws_url):
+        rss_before = _rss_kib()
+        start = hass.loop.time()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        setup_seconds = hass.loop.time() - start
+        rss_after = _rss_kib()
+        await asyncio.wait_for(cloud.connected.wait(), 10)
+        [coordinator] = hass.data[DOMAIN][entry.entry_id]
+
+        unsub_writes = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+        events = unit_count * EVENTS_PER_UNIT
+        start = hass.loop.time()
+        for setpoint in range(17, 17 + EVENTS_PER_UNIT):
+            for unit_id in cloud.units:
+                await cloud.async_push(unit_id, activeSetpoint=setpoint)
+        final = 16 + EVENTS_PER_UNIT
+        await _async_wait_for(
+            lambda: all(unit.setpoint == final for unit in coordinator.units)
+            and not coordinator._pending_updates
+        )
+        events_seconds = hass.loop.time() - start
+        await hass.async_block_till_done()
+        unsub_writes()
+
+        entity_ids = hass.states.async_entity_ids(CLIMATE_DOMAIN)[:COMMANDS]
+        await asyncio.gather(
+            *(
+                hass.services.async_call(
+                    CLIMATE_DOMAIN,
+                    SERVICE_SET_TEMPERATURE,
+                    {ATTR_ENTITY_ID: entity_id, ATTR_TEMPERATURE: 19},
+                    blocking=True,
+                )
+                for entity_id in entity_ids
+            )
+        )
+
+        commands = coordinator.latency["command"].as_dict()
+        push = coordinator.latency["receive_to_write"].as_dict()
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    await cloud.async_stop()
+
+    memory = (
+        "n/a" if rss_before is None else f"{(rss_after - rss_before) / 1024:.1f} MiB"
+    )
+    print(
+        f"\n{unit_count:>5} units: setup {setup_seconds * 1000:.0f} ms, "
+        f"{events / events_seconds:.0f} events/s, "
+        f"{writes / events:.2f} state writes/event, "
+        f"push p50/p95/p99 {push['p50_ms']}/{push['p95_ms']}/{push['p99_ms']} ms, "
+        f"command p50 {commands['p50_ms']} ms, "
+        f"setup RSS +{memory}, {cloud.requests} REST requests"
+    )
+
+
+@pytest.mark.skipif(
+    not os.environ.get("COOL_OPEN_REPLAY"), reason="set COOL_OPEN_REPLAY to a recording"
+)
+async def test_replay(hass, client_singleton, socket_enabled):
+    path = os.environ["COOL_OPEN_REPLAY"]
+    speed = float(os.environ.get("COOL_OPEN_REPLAY_SPEED", "0"))
+    events = await hass.async_add_executor_job(read_recording, path)
+    unit_ids = list(
+        dict.fromkeys(
+            event.message.unit_id
+            for _, event in events
+            if isinstance(event, UnitUpdate)
+        )
+    )
+    cloud = FakeCoolAutomationCloud(len(unit_ids), unit_ids)
+    await cloud.async_start()
+    entry = _entry(hass, cloud)
+    writes = 0
+
+    @callback
+    def _count_write(event) -> None:
+        nonlocal writes
+        if event.data["entity_id"].startswith(f"{CLIMATE_DOMAIN}."):
+            writes += 1
+
+    with patch.object(CoolAutomationClient, "SOCKET_URI", cloud.ws_url):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        [coordinator] = hass.data[DOMAIN][entry.entry_id]
+
+        unsub_writes = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+        start = hass.loop.time()
+        replayed = await async_replay(coordinator, path, speed)
+        await _async_wait_for(lambda: not coordinator._pending_updates)
+        seconds = hass.loop.time() - start
+        await hass.async_block_till_done()
+        unsub_writes()
+
+        apply = coordinator.latency["apply"].as_dict()
+        push = coordinator.latency["receive_to_write"].as_dict()
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    await cloud.async_stop()
+
+    print(
+        f"\nReplayed {replayed} events of {len(unit_ids)} units "
+        f"in {seconds * 1000:.0f} ms at speed {speed:g}, "
+        f"{writes} climate state writes, "
+        f"{coordinator.suppressed_updates} suppressed, "
+        f"apply p50/p99 {apply['p50_ms']}/{apply['p99_ms']} ms, "
+        f"push p50/p95/p99 {push['p50_ms']}/{push['p95_ms']}/{push['p99_ms']} ms, "
+        f"{cloud.requests} REST requests"
+    )
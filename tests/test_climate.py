@@ -7,14 +7,18 @@ that display value back to the API's uppercase form before validating and
 sending it, so `set_fan_mode` reaches the client with the raw mode.
 
 These tests stub the cool_open_client surface the method touches so no HTTP
-calls are made, and patch REFRESH_DELAY to 0 so no real sleeping occurs.
+calls are made, and patch COMMAND_CONFIRM_TIMEOUT to 0 so no real waiting
+for a WS confirmation occurs.
 """
 from __future__ import annotations
 
+import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from homeassistant.components.climate import HVACMode
 from homeassistant.exceptions import HomeAssistantError
 
 from custom_components.cool_open_integration.climate import CoolAutomationUnitEntity
@@ -47,10 +51,10 @@ FULL_REAL_FAN_DISPLAY = [
 
 
 @pytest.fixture(autouse=True)
-def _no_refresh_delay():
-    """Collapse the post-set refresh delay so success paths never sleep 3s."""
+def _no_confirm_timeout():
+    """Collapse the WS confirmation wait so success paths never wait 3s."""
     with patch(
-        "custom_components.cool_open_integration.climate.REFRESH_DELAY", 0
+        "custom_components.cool_open_integration.climate.COMMAND_CONFIRM_TIMEOUT", 0
     ):
         yield
 
@@ -76,11 +80,29 @@ def _make_entity(
     unit.set_swing_mode = AsyncMock() if set_swing_mode is None else set_swing_mode
 
     coordinator = MagicMock()
-    coordinator.async_request_refresh = AsyncMock()
+    coordinator.expectations = []
+
+    def _expect(unit_id, predicate):
+        future = asyncio.get_running_loop().create_future()
+        coordinator.expectations.append((predicate, future))
+        return future
+
+    coordinator.async_expect_unit_update = MagicMock(side_effect=_expect)
+    coordinator.async_refresh_unit = AsyncMock()
+
+    async def _send(unit_id, field, command):
+        await command()
+        return True
+
+    coordinator.async_send_command = AsyncMock(side_effect=_send)
 
     entity = CoolAutomationUnitEntity.__new__(CoolAutomationUnitEntity)
+    entity._device_id = "unit-1"
     entity.unit = unit
     entity.coordinator = coordinator
+    entity._optimistic = {}
+    entity.async_write_ha_state = MagicMock()
+    entity._build_capability_attributes()
     return entity
 
 
@@ -112,13 +134,121 @@ async def test_round_trip_display_value_maps_to_raw_mode(raw_mode):
     entity.unit.set_fan_mode.assert_awaited_once_with(raw_mode)
 
 
-async def test_successful_set_requests_coordinator_refresh():
-    """A successful set triggers a coordinator refresh so HA re-reads state."""
+async def test_unconfirmed_set_refreshes_only_this_unit():
+    """Without a WS confirmation, only this unit is re-read over HTTP."""
+    entity = _make_entity()
+
+    await entity.async_set_fan_mode("High")
+
+    entity.coordinator.async_refresh_unit.assert_awaited_once_with("unit-1")
+
+
+async def test_ws_confirmed_set_skips_refresh():
+    """A matching UPDATE_UNIT completes the command without any HTTP refresh."""
+    entity = _make_entity()
+
+    async def _echo(mode):
+        # The server pushes the new state while the command is in flight.
+        for predicate, future in entity.coordinator.expectations:
+            if predicate(SimpleNamespace(fan_mode=mode)):
+                future.set_result(None)
+
+    entity.unit.set_fan_mode = AsyncMock(side_effect=_echo)
+
+    with patch(
+        "custom_components.cool_open_integration.climate.COMMAND_CONFIRM_TIMEOUT", 1
+    ):
+        await entity.async_set_fan_mode("High")
+
+    entity.unit.set_fan_mode.assert_awaited_once_with("HIGH")
+    entity.coordinator.async_refresh_unit.assert_not_awaited()
+
+
+async def test_failed_set_cancels_the_confirmation_wait():
+    """A command the client rejects stops waiting for its confirmation."""
+    entity = _make_entity(set_fan_mode=AsyncMock(side_effect=Exception("boom")))
+
+    with pytest.raises(HomeAssistantError):
+        await entity.async_set_fan_mode("High")
+
+    [(_, future)] = entity.coordinator.expectations
+    assert future.cancelled()
+    entity.coordinator.async_refresh_unit.assert_not_awaited()
+
+
+async def test_requested_mode_is_shown_until_confirmed():
+    """The requested fan mode is displayed while the command is in flight."""
+    entity = _make_entity()
+    entity.unit.fan_mode = "Low"
+    shown = []
+
+    async def _send(mode):
+        shown.append(entity.fan_mode)
+        entity.unit.fan_mode = mode.capitalize()
+        for predicate, future in entity.coordinator.expectations:
+            future.set_result(None)
+
+    entity.unit.set_fan_mode = AsyncMock(side_effect=_send)
+
+    with patch(
+        "custom_components.cool_open_integration.climate.COMMAND_CONFIRM_TIMEOUT", 1
+    ):
+        await entity.async_set_fan_mode("High")
+
+    assert shown == ["High"]
+    assert entity._optimistic == {}
+    assert entity.fan_mode == "High"
+
+
+async def test_unapplied_mode_rolls_back_with_warning(caplog):
+    """A refresh that still shows the old state drops the optimistic value."""
     entity = _make_entity()
+    entity.unit.fan_mode = "Low"
+    entity.coordinator.async_refresh_unit = AsyncMock(
+        return_value=SimpleNamespace(fan_mode="LOW")
+    )
 
     await entity.async_set_fan_mode("High")
 
-    entity.coordinator.async_request_refresh.assert_awaited_once()
+    assert entity.fan_mode == "Low"
+    assert "rolling back" in caplog.text
+
+
+async def test_failed_set_rolls_back_optimistic_value():
+    """A command the client rejects restores the unit's real state."""
+    entity = _make_entity(set_fan_mode=AsyncMock(side_effect=Exception("boom")))
+    entity.unit.fan_mode = "Low"
+
+    with pytest.raises(HomeAssistantError):
+        await entity.async_set_fan_mode("High")
+
+    assert entity.fan_mode == "Low"
+    assert entity.async_write_ha_state.call_count == 2
+
+
+async def test_superseded_set_leaves_confirmation_to_the_newer_one():
+    """A command replaced in the queue neither waits nor refreshes."""
+    entity = _make_entity()
+    entity.unit.fan_mode = "Low"
+    entity.coordinator.async_send_command = AsyncMock(return_value=False)
+
+    await entity.async_set_fan_mode("High")
+
+    [(_, future)] = entity.coordinator.expectations
+    assert future.cancelled()
+    entity.coordinator.async_refresh_unit.assert_not_awaited()
+    assert entity._optimistic == {}
+
+
+async def test_cloud_spelling_maps_to_the_same_mode():
+    """A service call may pass the cloud's uppercase mode; it maps back too."""
+    entity = _make_entity(fan_modes=list(FULL_REAL_FAN_MODES))
+
+    await entity.async_set_fan_mode("FU-LO")
+
+    entity.unit.set_fan_mode.assert_awaited_once_with("FU-LO")
+    entity.unit.fan_mode = "FU-LO"
+    assert entity.fan_mode == "Fu-lo"
 
 
 async def test_invalid_mode_raises_value_error_without_calling_client():
@@ -213,13 +343,13 @@ async def test_current_swing_mode_is_raw_and_matches_list(current):
     assert entity.swing_mode in entity.swing_modes
 
 
-async def test_successful_swing_set_requests_coordinator_refresh():
-    """A successful swing set triggers a coordinator refresh."""
+async def test_unconfirmed_swing_set_refreshes_only_this_unit():
+    """Without a WS confirmation, a swing set re-reads only this unit."""
     entity = _make_entity()
 
     await entity.async_set_swing_mode("auto")
 
-    entity.coordinator.async_request_refresh.assert_awaited_once()
+    entity.coordinator.async_refresh_unit.assert_awaited_once_with("unit-1")
 
 
 @pytest.mark.parametrize("bad_mode", ["Vertical", "diagonal"])
@@ -359,3 +489,71 @@ async def test_current_swing_mode_off_on_raw_and_in_list(current):
 
     assert entity.swing_mode == current
     assert entity.swing_mode in entity.swing_modes
+
+
+async def test_fan_modes_are_cached_and_swing_modes_follow_the_unit():
+    """Fan modes are built once; swing modes change as the unit turns on."""
+    entity = _make_entity(fan_modes=["LOW"], swing_modes=["off"])
+    cached = entity.fan_modes
+
+    assert entity.fan_modes is cached
+    assert entity.swing_modes == ["off"]
+
+    entity.unit.swing_modes = list(RAW_SWING_MODES)
+
+    assert entity.swing_modes == RAW_SWING_MODES
+
+
+async def test_hvac_mode_maps_to_the_cloud_mode():
+    entity = _make_entity()
+    entity.unit.operation_modes = ["COOL", "HEAT", "AUTO"]
+    entity.unit.is_on = True
+    entity.unit.operation_mode = "COOL"
+    entity.unit.set_opration_mode = AsyncMock()
+    entity._build_capability_attributes()
+
+    await entity.async_set_hvac_mode(HVACMode.HEAT_COOL)
+
+    entity.unit.set_opration_mode.assert_awaited_once_with("AUTO")
+
+
+async def test_hvac_mode_the_unit_lacks_is_rejected():
+    entity = _make_entity()
+    entity.unit.operation_modes = ["COOL"]
+    entity.unit.set_opration_mode = AsyncMock()
+    entity._build_capability_attributes()
+
+    with pytest.raises(ValueError):
+        await entity.async_set_hvac_mode(HVACMode.HEAT)
+
+    entity.unit.set_opration_mode.assert_not_awaited()
+
+
+async def test_superseded_mode_still_turns_the_unit_on():
+    """A newer mode replacing the queued one does not drop the turn_on."""
+    entity = _make_entity()
+    entity.unit.operation_modes = ["COOL", "HEAT"]
+    entity.unit.is_on = False
+    entity.unit.operation_mode = "COOL"
+    entity.unit.set_opration_mode = AsyncMock()
+    entity.unit.turn_on = AsyncMock()
+    entity._build_capability_attributes()
+    sent = []
+
+    async def _send(unit_id, field, command):
+        if field == "operation_mode":
+            return False
+        sent.append(field)
+        await command()
+        return True
+
+    entity.coordinator.async_send_command = AsyncMock(side_effect=_send)
+    # Shown as heating already, but the unit itself is still off.
+    entity._optimistic["hvac_mode"] = HVACMode.HEAT
+
+    await entity.async_set_hvac_mode(HVACMode.COOL)
+
+    assert sent == ["operation_status"]
+    entity.unit.turn_on.assert_awaited_once()
+    [(_, future)] = entity.coordinator.expectations
+    assert future.cancelled()
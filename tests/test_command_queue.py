@@ -0,0 +1,123 @@
+"""Tests for the rate-limited outbound CommandQueue."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.cool_open_integration.command_queue import CommandQueue
+
+
+async def test_newer_command_supersedes_queued_one(hass):
+    # One slot, so the setpoints queue behind the mode command.
+    queue = CommandQueue(hass, rate=1000, burst=1)
+    release = asyncio.Event()
+    sent = []
+
+    async def _blocking():
+        await release.wait()
+        sent.append("mode")
+
+    def _setpoint(value):
+        async def _send():
+            sent.append(value)
+
+        return _send
+
+    def _submit(field, command):
+        return hass.async_create_task(queue.async_submit(("unit-A", field), command))
+
+    in_flight = _submit("mode", _blocking)
+    await asyncio.sleep(0)
+    first = _submit("setpoint", _setpoint(21))
+    await asyncio.sleep(0)
+    second = _submit("setpoint", _setpoint(22))
+    await asyncio.sleep(0)
+
+    assert await first is False
+    assert queue.depth == 1
+    release.set()
+
+    assert await in_flight is True
+    assert await second is True
+    assert sent == ["mode", 22]
+    assert queue.sent == 2
+    assert queue.dropped == 1
+    assert queue.depth == 0
+
+
+async def test_commands_for_different_keys_are_sent_concurrently(hass):
+    queue = CommandQueue(hass, rate=1000, burst=2)
+    release = asyncio.Event()
+    started = []
+
+    def _blocking(name):
+        async def _send():
+            started.append(name)
+            await release.wait()
+
+        return _send
+
+    sends = [
+        hass.async_create_task(queue.async_submit(key, _blocking(key)))
+        for key in (("unit-A", "mode"), ("unit-B", "mode"), ("unit-C", "mode"))
+    ]
+    await asyncio.sleep(0.01)
+
+    # Two in flight, the third waits for a slot.
+    assert started == [("unit-A", "mode"), ("unit-B", "mode")]
+    release.set()
+    assert await asyncio.gather(*sends) == [True, True, True]
+    assert len(started) == 3
+
+
+async def test_commands_sharing_a_key_never_overlap(hass):
+    queue = CommandQueue(hass, rate=1000, burst=10)
+    release = asyncio.Event()
+    sent = []
+
+    async def _first():
+        await release.wait()
+        sent.append(21)
+
+    async def _second():
+        sent.append(22)
+
+    first = hass.async_create_task(queue.async_submit(("unit-A", "setpoint"), _first))
+    await asyncio.sleep(0)
+    second = hass.async_create_task(
+        queue.async_submit(("unit-A", "setpoint"), _second)
+    )
+    await asyncio.sleep(0.01)
+
+    assert sent == []
+    release.set()
+    assert await first is True
+    assert await second is True
+    assert sent == [21, 22]
+
+
+async def test_commands_beyond_the_burst_wait_for_tokens(hass):
+    queue = CommandQueue(hass, rate=20, burst=1)
+    command = AsyncMock()
+    start = hass.loop.time()
+
+    await asyncio.gather(
+        queue.async_submit(("unit-A", "fan_mode"), command),
+        queue.async_submit(("unit-B", "fan_mode"), command),
+    )
+
+    assert command.await_count == 2
+    assert hass.loop.time() - start >= 0.04
+
+
+async def test_command_error_reaches_its_submitter(hass):
+    queue = CommandQueue(hass, rate=1000, burst=10)
+
+    with pytest.raises(ValueError):
+        await queue.async_submit(
+            ("unit-A", "swing"), AsyncMock(side_effect=ValueError)
+        )
+
+    assert await queue.async_submit(("unit-A", "swing"), AsyncMock()) is True
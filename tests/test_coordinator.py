@@ -5,15 +5,22 @@ no HTTP calls are made.
 """
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
 from custom_components.cool_open_integration.coordinator import (
     CoolAutomationDataUpdateCoordinator,
 )
 
+COORDINATOR = "custom_components.cool_open_integration.coordinator"
+
 
 def _make_unit(unit_id: str):
     """Return a stub HVACUnit with the surface the coordinator touches."""
@@ -24,9 +31,18 @@ def _make_unit(unit_id: str):
     return unit
 
 
-def _make_update_message(unit_id: str):
-    """Return a stub UnitUpdateMessage; identity is enough for our tests."""
-    return SimpleNamespace(unit_id=unit_id)
+def _make_update_message(unit_id: str, **state):
+    """Return a stub UnitUpdateMessage carrying the state fields we compare."""
+    fields = {
+        "operation_mode": "COOL",
+        "operation_status": "on",
+        "setpoint": 24,
+        "ambient_temperature": 26,
+        "fan_mode": "LOW",
+        "swing": "auto",
+    }
+    fields.update(state)
+    return SimpleNamespace(unit_id=unit_id, **fields)
 
 
 @pytest.mark.asyncio
@@ -99,14 +115,13 @@ async def test_missing_unit_in_bulk_response_keeps_last_known_state(hass):
 
 from types import SimpleNamespace
 
-from custom_components.cool_open_integration import _ws_pump
+from custom_components.cool_open_integration.ws_hub import _ws_pump
 
 
-def _make_unit_update_event(unit_id: str):
+def _make_unit_update_event(unit_id: str, **state):
     """Stand-in for cool_open_client.ws_events.UnitUpdate; identity tested by isinstance against the real class."""
     from cool_open_client.ws_events import UnitUpdate
-    msg = SimpleNamespace(unit_id=unit_id)
-    return UnitUpdate(msg)
+    return UnitUpdate(_make_update_message(unit_id, **state))
 
 
 async def _aiter_from(events):
@@ -126,14 +141,22 @@ async def test_ws_pump_routes_unit_update_to_in_memory_unit(hass):
     coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
     coordinator.data = {u.id: u for u in units}
     coordinator.async_set_updated_data = MagicMock()
+    listener_a, listener_b, bulk_listener = MagicMock(), MagicMock(), MagicMock()
+    coordinator.async_add_unit_listener("unit-A", listener_a)
+    coordinator.async_add_unit_listener("unit-B", listener_b)
+    remove_bulk_listener = coordinator.async_add_listener(bulk_listener)
 
     await _ws_pump(coordinator)
+    remove_bulk_listener()
 
     # unit-A got the WS update; unit-B was untouched.
     units[0]._update_unit.assert_called_once()
     units[1]._update_unit.assert_not_called()
-    # Coordinator was notified.
-    coordinator.async_set_updated_data.assert_called_once()
+    # Only unit-A's listener was woken; no whole-coordinator fan-out.
+    listener_a.assert_called_once()
+    listener_b.assert_not_called()
+    bulk_listener.assert_not_called()
+    coordinator.async_set_updated_data.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -168,9 +191,505 @@ async def test_ws_pump_unknown_unit_id_ignored(hass):
     coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
     coordinator.data = {u.id: u for u in units}
     coordinator.async_set_updated_data = MagicMock()
+    listener = MagicMock()
+    coordinator.async_add_unit_listener("unit-A", listener)
 
     # Must not raise.
     await _ws_pump(coordinator)
 
     units[0]._update_unit.assert_not_called()
     coordinator.async_set_updated_data.assert_not_called()
+    listener.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_refresh_still_notifies_every_listener(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={u.id: _make_update_message(u.id) for u in units}
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    bulk_listener = MagicMock()
+    unit_listener = MagicMock()
+    coordinator.async_add_listener(bulk_listener)
+    coordinator.async_add_unit_listener("unit-A", unit_listener)
+
+    await coordinator.async_refresh()
+
+    # The reconcile wakes every entity through the regular listener set.
+    bulk_listener.assert_called_once()
+    unit_listener.assert_not_called()
+    await coordinator.async_shutdown()
+
+
+def test_removed_unit_listener_is_not_called(hass):
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(
+        hass, entry, MagicMock(), [_make_unit("unit-A")]
+    )
+    kept, removed = MagicMock(), MagicMock()
+    coordinator.async_add_unit_listener("unit-A", kept)
+    remove = coordinator.async_add_unit_listener("unit-A", removed)
+
+    remove()
+    coordinator.async_update_unit_listeners("unit-A")
+
+    kept.assert_called_once()
+    removed.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_ws_burst_is_coalesced_into_one_write_per_unit(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B")]
+    burst = [
+        _make_unit_update_event("unit-A", operation_mode="HEAT"),
+        _make_unit_update_event("unit-A", fan_mode="HIGH"),
+        _make_unit_update_event("unit-B"),
+        _make_unit_update_event("unit-A", setpoint=21),
+    ]
+    client = MagicMock()
+    client.subscribe_unit_updates = MagicMock(return_value=_aiter_from(burst))
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(
+        hass, entry, client, units, coalesce_window=0.1
+    )
+    listener_a, listener_b = MagicMock(), MagicMock()
+    coordinator.async_add_unit_listener("unit-A", listener_a)
+    coordinator.async_add_unit_listener("unit-B", listener_b)
+
+    await _ws_pump(coordinator)
+
+    # Nothing applied until the window closes.
+    units[0]._update_unit.assert_not_called()
+    listener_a.assert_not_called()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    # Only the latest message per unit is applied, with one write each.
+    units[0]._update_unit.assert_called_once_with(burst[-1].message)
+    units[1]._update_unit.assert_called_once_with(burst[2].message)
+    listener_a.assert_called_once()
+    listener_b.assert_called_once()
+
+
+def _make_real_unit(unit_id: str, **state):
+    """Return a stub unit whose rendered state matches `_make_update_message`."""
+    unit = _make_unit(unit_id)
+    message = _make_update_message(unit_id, **state)
+    unit.operation_mode = message.operation_mode
+    unit.operation_status = message.operation_status
+    unit.setpoint = message.setpoint
+    unit.ambient_temperature = message.ambient_temperature
+    unit.fan_mode = message.fan_mode
+    unit.swing_mode = message.swing
+    return unit
+
+
+@pytest.mark.asyncio
+async def test_ws_update_matching_held_state_is_suppressed(hass):
+    units = [_make_real_unit("unit-A")]
+    client = MagicMock()
+    client.subscribe_unit_updates = MagicMock(
+        return_value=_aiter_from(
+            [
+                _make_unit_update_event("unit-A"),
+                # Sub-degree ambient jitter rounds to the state already held.
+                _make_unit_update_event("unit-A", ambient_temperature=26.2),
+                _make_unit_update_event("unit-A", setpoint=22),
+            ]
+        )
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    listener = MagicMock()
+    coordinator.async_add_unit_listener("unit-A", listener)
+
+    await _ws_pump(coordinator)
+
+    # Only the setpoint change reached the unit and its entity.
+    units[0]._update_unit.assert_called_once()
+    assert units[0]._update_unit.call_args.args[0].setpoint == 22
+    listener.assert_called_once()
+    assert coordinator.suppressed_updates == 2
+
+
+@pytest.mark.asyncio
+async def test_ws_update_records_push_latency(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B")]
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, MagicMock(), units)
+    coordinator.async_add_unit_listener("unit-A", MagicMock())
+
+    coordinator.async_handle_unit_update(_make_update_message("unit-A", setpoint=22))
+    # No entity listens to unit-B, so nothing of it is written.
+    coordinator.async_handle_unit_update(_make_update_message("unit-B", setpoint=22))
+
+    assert len(coordinator.latency["apply"]) == 2
+    assert len(coordinator.latency["receive_to_write"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_ws_update_is_suppressed_after_first_apply(hass):
+    units = [_make_unit("unit-A")]
+    client = MagicMock()
+    client.subscribe_unit_updates = MagicMock(
+        return_value=_aiter_from(
+            [_make_unit_update_event("unit-A", setpoint=22)] * 3
+        )
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+
+    await _ws_pump(coordinator)
+
+    units[0]._update_unit.assert_called_once()
+    assert coordinator.suppressed_updates == 2
+
+
+@pytest.mark.asyncio
+async def test_reconcile_schedule_is_not_pushed_out_by_ws_traffic(hass):
+    units = [_make_unit("unit-A")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={"unit-A": _make_update_message("unit-A")}
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    coordinator.data = {u.id: u for u in units}
+    coordinator.async_schedule_reconcile()
+    start = dt_util.utcnow()
+
+    # A steady stream of pushes right up to the deadline.
+    for minute, setpoint in ((1, 20), (3, 21), (4, 22)):
+        async_fire_time_changed(hass, start + timedelta(minutes=minute))
+        coordinator.async_handle_unit_update(
+            _make_update_message("unit-A", setpoint=setpoint)
+        )
+        coordinator.async_set_updated_data(coordinator.data)
+    await hass.async_block_till_done()
+    assert client.get_updated_controllable_units.await_count == 0
+    assert coordinator.last_reconcile is None
+
+    async_fire_time_changed(hass, start + timedelta(minutes=5, seconds=1))
+    await hass.async_block_till_done()
+
+    assert client.get_updated_controllable_units.await_count == 1
+    assert coordinator.last_reconcile is not None
+
+    # And it keeps its own cadence afterwards.
+    async_fire_time_changed(hass, start + timedelta(minutes=10, seconds=2))
+    await hass.async_block_till_done()
+    assert client.get_updated_controllable_units.await_count == 2
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_interval_adapts_to_ws_health_and_drift(hass):
+    units = [_make_real_unit("unit-A")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={"unit-A": _make_update_message("unit-A")}
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    coordinator.data = {u.id: u for u in units}
+    coordinator.async_set_ws_running(True)
+    coordinator.async_schedule_reconcile()
+    start = dt_util.utcnow()
+
+    # Healthy WS and nothing to correct: the interval stretches.
+    async_fire_time_changed(hass, start + timedelta(minutes=5, seconds=1))
+    await hass.async_block_till_done()
+    assert coordinator.reconcile_interval == timedelta(minutes=10)
+    async_fire_time_changed(hass, start + timedelta(minutes=15, seconds=2))
+    await hass.async_block_till_done()
+    assert coordinator.reconcile_interval == timedelta(minutes=20)
+
+    # The poll corrected state the WS never delivered: back to the base.
+    client.get_updated_controllable_units.return_value = {
+        "unit-A": _make_update_message("unit-A", setpoint=18)
+    }
+    async_fire_time_changed(hass, start + timedelta(minutes=35, seconds=3))
+    await hass.async_block_till_done()
+    assert coordinator.last_reconcile_drifted
+    assert coordinator.reconcile_interval == timedelta(minutes=5)
+
+    # Drift again: tighten further.
+    async_fire_time_changed(hass, start + timedelta(minutes=40, seconds=4))
+    await hass.async_block_till_done()
+    assert coordinator.reconcile_interval == timedelta(minutes=2.5)
+
+    assert coordinator.request_counts["reconcile"] == 4
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_keeps_reconcile_interval_tight(hass):
+    units = [_make_real_unit("unit-A")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={"unit-A": _make_update_message("unit-A")}
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    coordinator.data = {u.id: u for u in units}
+    coordinator.async_set_ws_running(True)
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_schedule_reconcile()
+    start = dt_util.utcnow()
+
+    await coordinator.async_handle_reconnected()
+    async_fire_time_changed(hass, start + timedelta(minutes=5, seconds=1))
+    await hass.async_block_till_done()
+
+    coordinator.async_request_refresh.assert_awaited_once()
+    assert coordinator.ws_reconnects == 1
+    assert coordinator.reconcile_interval == timedelta(minutes=2.5)
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pump_stopping_brings_the_reconcile_forward(hass):
+    units = [_make_real_unit("unit-A")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={"unit-A": _make_update_message("unit-A")}
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    coordinator.data = {u.id: u for u in units}
+    coordinator.async_set_ws_running(True)
+    coordinator.async_schedule_reconcile()
+    start = dt_util.utcnow()
+
+    coordinator.async_set_ws_running(False)
+    async_fire_time_changed(hass, start + timedelta(minutes=1, seconds=1))
+    await hass.async_block_till_done()
+
+    client.get_updated_controllable_units.assert_awaited_once()
+    assert coordinator.reconcile_interval == timedelta(minutes=1)
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_reports_drift_per_unit_and_field(hass):
+    units = [_make_real_unit("unit-A"), _make_real_unit("unit-B")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={
+            "unit-A": _make_update_message("unit-A", setpoint=19, fan_mode="HIGH"),
+            "unit-B": _make_update_message("unit-B"),
+        }
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+
+    await coordinator._async_update_data()
+
+    # Only what the WS path had not delivered counts as drift.
+    assert coordinator.drift_counts == {"unit-A": {"setpoint": 1, "fan_mode": 1}}
+    assert coordinator.drift_by_field == {"setpoint": 1, "fan_mode": 1}
+    assert coordinator.last_drift == coordinator.last_reconcile
+    assert coordinator.last_reconcile_drifted
+
+
+@pytest.mark.asyncio
+async def test_reconcile_supersedes_ws_update_still_being_coalesced(hass):
+    units = [_make_real_unit("unit-A")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={"unit-A": _make_update_message("unit-A", setpoint=19)}
+    )
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(
+        hass, entry, client, units, coalesce_window=1
+    )
+    # Received before the bulk response, still buffered when it lands.
+    coordinator.async_handle_unit_update(_make_update_message("unit-A", setpoint=19))
+
+    await coordinator._async_update_data()
+
+    # The WS path had delivered the setpoint: no drift.
+    assert coordinator.drift_counts == {}
+    assert not coordinator.last_reconcile_drifted
+    assert coordinator._pending_updates == {}
+    units[0]._update_unit.assert_called_once()
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_expectation_resolved_by_matching_ws_update_or_echo(hass):
+    units = [_make_real_unit("unit-A")]
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, MagicMock(), units)
+
+    setpoint_22 = coordinator.async_expect_unit_update(
+        "unit-A", lambda message: message.setpoint == 22
+    )
+    # An echo of the state already held is suppressed but still confirms.
+    fan_low = coordinator.async_expect_unit_update(
+        "unit-A", lambda message: message.fan_mode == "LOW"
+    )
+
+    coordinator.async_handle_unit_update(_make_update_message("unit-A"))
+    assert fan_low.done()
+    assert not setpoint_22.done()
+
+    coordinator.async_handle_unit_update(_make_update_message("unit-A", setpoint=22))
+    assert setpoint_22.done()
+    await hass.async_block_till_done()
+    assert coordinator._expectations == {}
+
+
+@pytest.mark.asyncio
+async def test_refresh_unit_applies_one_unit_without_bulk_call(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B")]
+    message = _make_update_message("unit-A", setpoint=22)
+    client = MagicMock()
+    client.get_updated_controllable_unit = AsyncMock(return_value=message)
+    client.get_updated_controllable_units = AsyncMock()
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    listener_a, listener_b = MagicMock(), MagicMock()
+    coordinator.async_add_unit_listener("unit-A", listener_a)
+    coordinator.async_add_unit_listener("unit-B", listener_b)
+
+    with patch(f"{COORDINATOR}.REFRESH_BATCH_WINDOW", 0):
+        assert await coordinator.async_refresh_unit("unit-A") is message
+
+    client.get_updated_controllable_unit.assert_awaited_once_with("unit-A")
+    client.get_updated_controllable_units.assert_not_awaited()
+    units[0]._update_unit.assert_called_once_with(message)
+    listener_a.assert_called_once()
+    listener_b.assert_not_called()
+    assert coordinator.request_counts["refresh"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_bulk_call(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B"), _make_unit("unit-C")]
+    updates = {u.id: _make_update_message(u.id, setpoint=20) for u in units}
+    client = MagicMock()
+    client.get_updated_controllable_unit = AsyncMock()
+    client.get_updated_controllable_units = AsyncMock(return_value=updates)
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+
+    with patch(f"{COORDINATOR}.REFRESH_BATCH_WINDOW", 0):
+        results = await asyncio.gather(
+            coordinator.async_refresh_unit("unit-A"),
+            coordinator.async_refresh_unit("unit-B"),
+            coordinator.async_refresh_unit("unit-A"),
+        )
+
+    assert results == [updates["unit-A"], updates["unit-B"], updates["unit-A"]]
+    client.get_updated_controllable_units.assert_awaited_once()
+    client.get_updated_controllable_unit.assert_not_awaited()
+    assert coordinator.coalesced_refreshes == 2
+    assert coordinator.request_counts["refresh"] == 1
+    units[0]._update_unit.assert_called_once_with(updates["unit-A"])
+    units[1]._update_unit.assert_called_once_with(updates["unit-B"])
+    units[2]._update_unit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batched_refresh_is_not_a_reconcile(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B"), _make_unit("unit-C")]
+    updates = {u.id: _make_update_message(u.id, setpoint=22) for u in units}
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(return_value=updates)
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(
+        hass, entry, client, units, coalesce_window=1
+    )
+    listeners = {u.id: MagicMock() for u in units}
+    for unit_id, listener in listeners.items():
+        coordinator.async_add_unit_listener(unit_id, listener)
+    coordinator_listener = MagicMock()
+    unsub = coordinator.async_add_listener(coordinator_listener)
+    # A WS update for unit-A still buffered when the refresh lands.
+    coordinator.async_handle_unit_update(_make_update_message("unit-A", setpoint=19))
+
+    with patch(f"{COORDINATOR}.REFRESH_BATCH_WINDOW", 0):
+        await asyncio.gather(
+            coordinator.async_refresh_unit("unit-A"),
+            coordinator.async_refresh_unit("unit-B"),
+        )
+
+    listeners["unit-A"].assert_called_once()
+    listeners["unit-B"].assert_called_once()
+    listeners["unit-C"].assert_not_called()
+    coordinator_listener.assert_not_called()
+    units[2]._update_unit.assert_not_called()
+    assert coordinator._pending_updates == {}
+    assert coordinator.last_reconcile is None
+    assert coordinator.drift_counts == {}
+    unsub()
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_batched_refresh_returns_none(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B")]
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(side_effect=OSError("down"))
+
+    entry = MagicMock()
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+
+    with patch(f"{COORDINATOR}.REFRESH_BATCH_WINDOW", 0):
+        results = await asyncio.gather(
+            coordinator.async_refresh_unit("unit-A"),
+            coordinator.async_refresh_unit("unit-B"),
+        )
+
+    assert results == [None, None]
+    units[0]._update_unit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_shards_share_one_in_flight_bulk_request(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B")]
+    release = asyncio.Event()
+
+    async def _bulk():
+        await release.wait()
+        return {u.id: _make_update_message(u.id) for u in units}
+
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(side_effect=_bulk)
+    entry = MagicMock()
+    first = CoolAutomationDataUpdateCoordinator(hass, entry, client, units[:1])
+    second = CoolAutomationDataUpdateCoordinator(
+        hass, entry, client, units[1:], bulk_fetch=first.bulk_fetch
+    )
+
+    refreshes = asyncio.gather(first.async_refresh(), second.async_refresh())
+    await asyncio.sleep(0)
+    release.set()
+    await refreshes
+
+    client.get_updated_controllable_units.assert_awaited_once()
+    # Each shard applies only its own units.
+    units[0]._update_unit.assert_called_once()
+    units[1]._update_unit.assert_called_once()
+    assert list(first.data) == ["unit-A"]
+    assert list(second.data) == ["unit-B"]
+    assert first.request_counts["reconcile"] + second.request_counts["reconcile"] == 1
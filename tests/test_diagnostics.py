@@ -0,0 +1,106 @@
+"""Tests for the config entry diagnostics download."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cool_open_integration.const import DATA_WS_HUB, DOMAIN
+from custom_components.cool_open_integration.coordinator import (
+    CoolAutomationDataUpdateCoordinator,
+)
+from custom_components.cool_open_integration.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.cool_open_integration.ws_hub import WsHub, WsSubscription
+
+
+async def test_diagnostics_redacts_credentials(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "username": "user@example.com",
+            "password": "hunter2",
+            "token": "secret-token",
+            "id": "user-id",
+        },
+    )
+    entry.add_to_hass(hass)
+    unit = MagicMock()
+    unit.id = "unit-A"
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, MagicMock(), [unit])
+    coordinator.async_record_request("reconcile")
+    coordinator.async_record_request("command")
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = [coordinator]
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert set(diagnostics["entry"]["data"].values()) == {"**REDACTED**"}
+    assert diagnostics["units"] == 1
+    assert diagnostics["reconcile"]["interval_seconds"] == 300
+    assert diagnostics["requests"]["counts"] == {"reconcile": 1, "command": 1}
+    assert diagnostics["requests"]["per_day"] > 0
+
+
+async def test_diagnostics_reports_ws_and_command_metrics(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={"token": "t"})
+    entry.add_to_hass(hass)
+    unit = MagicMock()
+    unit.id = "unit-A"
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(return_value={})
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, [unit])
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = [coordinator]
+    hub = hass.data[DOMAIN][DATA_WS_HUB] = WsHub(hass)
+    hub.subscriptions["t"] = subscription = WsSubscription(client, "t")
+    subscription.async_add(coordinator)
+    subscription.restarts = 2
+
+    await coordinator._async_update_data()
+    coordinator.async_handle_unit_update(
+        SimpleNamespace(
+            unit_id="unit-A",
+            operation_mode="COOL",
+            operation_status="on",
+            setpoint=24,
+            ambient_temperature=26,
+            fan_mode="LOW",
+            swing="auto",
+        )
+    )
+    await coordinator.async_send_command("unit-A", "setpoint", AsyncMock())
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["reconcile"]["last_duration_seconds"] >= 0
+    assert diagnostics["ws"]["state"] == "running"
+    assert diagnostics["ws"]["restarts"] == 2
+    assert diagnostics["ws"]["events_per_minute"] == 1
+    assert diagnostics["latency"]["command"]["count"] == 1
+
+
+async def test_diagnostics_reports_shards_separately(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={"token": "t"})
+    entry.add_to_hass(hass)
+    coordinators = []
+    for shard, unit_id in (("device-1", "unit-A"), ("device-2", "unit-B")):
+        unit = MagicMock()
+        unit.id = unit_id
+        coordinators.append(
+            CoolAutomationDataUpdateCoordinator(
+                hass, entry, MagicMock(), [unit], shard=shard
+            )
+        )
+    coordinators[1].async_record_request("reconcile")
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinators
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["units"] == 2
+    assert "reconcile" not in diagnostics
+    assert set(diagnostics["shards"]) == {"device-1", "device-2"}
+    assert diagnostics["shards"]["device-1"]["units"] == 1
+    assert diagnostics["shards"]["device-2"]["requests"]["counts"] == {
+        "reconcile": 1
+    }
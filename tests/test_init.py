@@ -0,0 +1,264 @@
+"""Tests for setting up a config entry."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cool_open_client.unit import HVACUnit
+from cool_open_client.utils.dictionaries import DictTypes
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.cool_open_integration.const import (
+    CONF_SHARD_BY_DEVICE,
+    DATA_WS_HUB,
+    DOMAIN,
+)
+
+INTEGRATION = "custom_components.cool_open_integration"
+
+DICTIONARIES = {
+    "temperature_scale": {"1": "celsius"},
+    "operation_statuses": {"1": "on", "2": "off"},
+    "operation_modes": {"0": "COOL", "1": "HEAT"},
+    "fan_modes": {"0": "LOW", "1": "HIGH"},
+    "swing_modes": {"0": "vertical", "3": "auto"},
+}
+
+
+class _Client(MagicMock):
+    """A stub client; the WS hub calls its class's subscribe_unit_updates."""
+
+    async def subscribe_unit_updates(self):
+        """A WS stream that stays connected without ever sending anything."""
+        await asyncio.Event().wait()
+        yield
+
+
+def _make_client():
+    """Return a stub client carrying real dictionaries."""
+    client = _Client()
+    for name, data in DICTIONARIES.items():
+        setattr(client, name, DictTypes(data))
+    client.get_updated_controllable_units = AsyncMock()
+    return client
+
+
+def _make_unit(client, name="Living room", unit_id="unit-A", fan_modes=("LOW", "HIGH")):
+    return HVACUnit(
+        unit_id,
+        name,
+        active_setpoint=24,
+        active_operation_status="on",
+        active_operation_mode="COOL",
+        ambient_temperature=26,
+        active_fan_mode="LOW",
+        active_swing_mode="auto",
+        temerature_range={"0": [16, 30], "1": [16, 30]},
+        supported_operation_statuses=["on", "off"],
+        supported_operation_modes=["COOL", "HEAT"],
+        supported_fan_modes=list(fan_modes),
+        supported_swing_modes=["vertical", "auto"],
+        is_half_degree=False,
+        client=client,
+    )
+
+
+def _entry(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={"username": "u", "password": "p", "token": "t"}
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+def _cloud(client, units=None, error=None):
+    """Patch the cloud: serve `units` through `client`, or fail with `error`."""
+    factory = MagicMock()
+    factory.generate_units_from_api = AsyncMock(return_value=units, side_effect=error)
+    return (
+        patch(
+            f"{INTEGRATION}.CoolAutomationClient.create",
+            AsyncMock(return_value=client, side_effect=error),
+        ),
+        patch(f"{INTEGRATION}.HVACUnitsFactory", return_value=factory),
+        patch(f"{INTEGRATION}.cache.CoolAutomationClient", return_value=client),
+    )
+
+
+async def _setup(hass, entry, cloud):
+    create, factory, offline = cloud
+    with create, factory, offline, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
+        AsyncMock(),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_setup_seeds_units_without_bulk_fetch(hass):
+    entry = _entry(hass)
+    client = _make_client()
+    unit = _make_unit(client)
+
+    await _setup(hass, entry, _cloud(client, [unit]))
+
+    [coordinator] = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.data == {"unit-A": unit}
+    assert coordinator.last_update_success
+    client.get_updated_controllable_units.assert_not_awaited()
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_setup_shards_units_by_controller(hass, hass_storage):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "u", "password": "p", "token": "t"},
+        options={CONF_SHARD_BY_DEVICE: True},
+    )
+    entry.add_to_hass(hass)
+    client = _make_client()
+    units = [_make_unit(client), _make_unit(client, "Bedroom", unit_id="unit-B")]
+    client.get_controllable_units = AsyncMock(
+        return_value=SimpleNamespace(
+            data={
+                "unit-A": {"id": "unit-A", "device": "device-1"},
+                "unit-B": {"id": "unit-B", "device": "device-2"},
+            }
+        )
+    )
+
+    await _setup(hass, entry, _cloud(client, units))
+
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    assert {c.shard: list(c.data) for c in coordinators} == {
+        "device-1": ["unit-A"],
+        "device-2": ["unit-B"],
+    }
+    first, second = coordinators
+    assert first.command_queue is second.command_queue
+    assert first.latency is second.latency
+    assert first.bulk_fetch is second.bulk_fetch
+    # The controllers come from the unit list the units were built from.
+    client.get_controllable_units.assert_awaited_once()
+    # Both shards are fed by the one connection of the account.
+    [subscription] = hass.data[DOMAIN][DATA_WS_HUB].subscriptions.values()
+    assert subscription.coordinators == coordinators
+    assert subscription.client.token == "t"
+    await hass.config_entries.async_unload(entry.entry_id)
+    assert hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]["devices"] == {
+        "unit-A": "device-1",
+        "unit-B": "device-2",
+    }
+
+
+async def test_turning_sharding_on_shards_the_cached_boot(hass, hass_storage):
+    entry = _entry(hass)
+    client = _make_client()
+    units = [_make_unit(client), _make_unit(client, "Bedroom", unit_id="unit-B")]
+    client.get_controllable_units = AsyncMock(
+        return_value=SimpleNamespace(
+            data={
+                "unit-A": {"id": "unit-A", "device": "device-1"},
+                "unit-B": {"id": "unit-B", "device": "device-2"},
+            }
+        )
+    )
+    await _setup(hass, entry, _cloud(client, units))
+    await hass.config_entries.async_unload(entry.entry_id)
+    # Unsharded, the controllers are neither known nor saved.
+    assert "devices" not in hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_SHARD_BY_DEVICE: True}
+    )
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        await _setup(hass, entry, _cloud(client, units))
+
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+    assert {c.shard: list(c.data) for c in coordinators} == {
+        "device-1": ["unit-A"],
+        "device-2": ["unit-B"],
+    }
+    # The background validation agrees with the shards; nothing to reload.
+    reload.assert_not_called()
+    await hass.config_entries.async_unload(entry.entry_id)
+    assert hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]["devices"] == {
+        "unit-A": "device-1",
+        "unit-B": "device-2",
+    }
+
+
+async def test_setup_caches_catalog_and_boots_from_it_offline(hass, hass_storage):
+    entry = _entry(hass)
+    client = _make_client()
+    await _setup(hass, entry, _cloud(client, [_make_unit(client)]))
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=2))
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.{entry.entry_id}" in hass_storage
+    await hass.config_entries.async_unload(entry.entry_id)
+    # Mark the stored state so the assertions below prove it was restored.
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]["units"][0]["state"][
+        "setpoint"
+    ] = 23
+
+    # The cloud is down at the next boot.
+    client = _make_client()
+    await _setup(hass, entry, _cloud(client, error=ConfigEntryNotReady))
+
+    assert entry.state is ConfigEntryState.LOADED
+    [coordinator] = hass.data[DOMAIN][entry.entry_id]
+    [unit] = coordinator.units
+    assert (unit.id, unit.name, unit.setpoint, unit.fan_modes) == (
+        "unit-A",
+        "Living room",
+        23,
+        ["LOW", "HIGH"],
+    )
+    assert client.fan_modes.get_inverse("HIGH") == 1
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_changed_catalog_reloads_the_entry(hass):
+    entry = _entry(hass)
+    client = _make_client()
+    await _setup(hass, entry, _cloud(client, [_make_unit(client)]))
+    await hass.config_entries.async_unload(entry.entry_id)
+
+    renamed = _make_unit(client, name="Study")
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        await _setup(hass, entry, _cloud(client, [renamed]))
+
+    reload.assert_called_once_with(entry.entry_id)
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_catalog_check_reloads_when_unit_modes_change(hass):
+    entry = _entry(hass)
+    client = _make_client()
+    client.get_updated_controllable_units.return_value = {}
+    await _setup(hass, entry, _cloud(client, [_make_unit(client)]))
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        _, factory, _ = _cloud(client, [_make_unit(client)])
+        with factory:
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=6))
+            await hass.async_block_till_done()
+        reload.assert_not_called()
+
+        _, factory, _ = _cloud(client, [_make_unit(client, fan_modes=["LOW"])])
+        with factory:
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=12))
+            await hass.async_block_till_done()
+        reload.assert_called_once_with(entry.entry_id)
+
+    await hass.config_entries.async_unload(entry.entry_id)
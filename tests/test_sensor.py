@@ -0,0 +1,93 @@
+"""Tests for the unit and diagnostic latency sensors."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cool_open_integration.const import DOMAIN
+from custom_components.cool_open_integration.coordinator import (
+    CoolAutomationDataUpdateCoordinator,
+)
+from custom_components.cool_open_integration.sensor import (
+    UNIT_SENSORS,
+    CoolAutomationLatencySensor,
+    CoolAutomationUnitSensor,
+)
+
+
+async def test_latency_sensor_reports_p95_in_milliseconds(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, MagicMock(), [])
+    for value in range(1, 101):
+        coordinator.latency["receive_to_write"].add(value / 1000)
+
+    sensor = CoolAutomationLatencySensor(coordinator, entry, "receive_to_write")
+
+    assert not sensor.entity_registry_enabled_default
+    assert sensor.unique_id == f"{entry.entry_id}_receive_to_write_latency"
+    assert sensor.native_value == 95.0
+    assert sensor.extra_state_attributes == {"count": 100, "p50": 50.0, "p99": 99.0}
+
+
+def _make_unit(unit_id: str, **state):
+    """Return a stub HVACUnit carrying the fields the unit sensors show."""
+    unit = MagicMock()
+    unit.id = unit_id
+    unit.name = unit_id
+    unit.ambient_temperature = 26
+    unit.operation_status = "on"
+    unit.operation_mode = "COOL"
+    for attr, value in state.items():
+        setattr(unit, attr, value)
+    return unit
+
+
+async def test_unit_sensors_read_their_field(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    unit = _make_unit("unit-A", operation_mode="HAUX")
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, MagicMock(), [unit])
+    coordinator.data = {unit.id: unit}
+
+    sensors = {
+        description.key: CoolAutomationUnitSensor(coordinator, unit.id, description)
+        for description in UNIT_SENSORS
+    }
+
+    assert sensors["ambient_temperature"].unique_id == "unit-A_ambient_temperature"
+    assert sensors["ambient_temperature"].native_value == 26
+    assert sensors["operation_status"].native_value == "on"
+    # Modes outside the enum options are unknown rather than invalid.
+    assert sensors["operation_mode"].native_value is None
+
+
+async def test_unit_sensor_writes_only_when_its_field_changes(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    unit = _make_unit("unit-A")
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, MagicMock(), [unit])
+    coordinator.data = {unit.id: unit}
+    description = next(d for d in UNIT_SENSORS if d.key == "ambient_temperature")
+    sensor = CoolAutomationUnitSensor(coordinator, unit.id, description)
+    sensor.hass = hass
+    sensor.async_write_ha_state = MagicMock()
+
+    unit.setpoint = 21
+    sensor._handle_coordinator_update()
+    sensor.async_write_ha_state.assert_not_called()
+
+    unit.ambient_temperature = 27
+    sensor._handle_coordinator_update()
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.native_value == 27
+
+
+async def test_unit_sensor_device_does_not_suggest_an_area(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    unit = _make_unit("unit-A")
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, MagicMock(), [unit])
+    coordinator.data = {unit.id: unit}
+
+    sensor = CoolAutomationUnitSensor(coordinator, unit.id, UNIT_SENSORS[0])
+
+    assert sensor.device_info["identifiers"] == {(DOMAIN, "unit-A")}
+    assert "suggested_area" not in sensor.device_info
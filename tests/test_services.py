@@ -0,0 +1,149 @@
+"""Tests for the ``set_units`` group-control service."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import voluptuous as vol
+
+from homeassistant.helpers import entity_registry as er
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cool_open_integration.const import DOMAIN, SERVICE_SET_UNITS
+from custom_components.cool_open_integration.coordinator import (
+    CoolAutomationDataUpdateCoordinator,
+)
+from custom_components.cool_open_integration.services import async_setup_services
+
+INTEGRATION = "custom_components.cool_open_integration"
+
+
+@pytest.fixture(autouse=True)
+def _no_waiting():
+    """Skip the confirmation wait and the refresh batching window."""
+    with patch(f"{INTEGRATION}.services.COMMAND_CONFIRM_TIMEOUT", 0), patch(
+        f"{INTEGRATION}.coordinator.REFRESH_BATCH_WINDOW", 0
+    ):
+        yield
+
+
+def _make_unit(unit_id: str):
+    """Return a stub HVACUnit that is off and cooling at 24 degrees."""
+    unit = MagicMock()
+    unit.id = unit_id
+    unit.is_on = False
+    unit.operation_modes = ["COOL", "HEAT"]
+    unit.min_temp, unit.max_temp = 16, 30
+    unit.set_opration_mode = AsyncMock()
+    unit.set_temperature_set_point = AsyncMock()
+    unit.turn_on = AsyncMock()
+    unit.turn_off = AsyncMock()
+    return unit
+
+
+def _message(unit_id: str, **state):
+    fields = {
+        "operation_mode": "COOL",
+        "operation_status": "on",
+        "setpoint": 22,
+        "ambient_temperature": 26,
+        "fan_mode": "LOW",
+        "swing": "auto",
+    }
+    fields.update(state)
+    return SimpleNamespace(unit_id=unit_id, **fields)
+
+
+def _setup(hass, units, client):
+    """Register `units` as climate entities of one entry and the service."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, entry, client, units)
+    coordinator.data = {unit.id: unit for unit in units}
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = [coordinator]
+    registry = er.async_get(hass)
+    entity_ids = [
+        registry.async_get_or_create(
+            "climate", DOMAIN, unit.id, config_entry=entry
+        ).entity_id
+        for unit in units
+    ]
+    async_setup_services(hass)
+    return coordinator, entity_ids
+
+
+async def test_set_units_reports_per_unit_result_with_one_refresh(hass):
+    units = [_make_unit("unit-A"), _make_unit("unit-B"), _make_unit("unit-C")]
+    units[2].set_opration_mode.side_effect = Exception("boom")
+    client = MagicMock()
+    client.get_updated_controllable_units = AsyncMock(
+        return_value={
+            "unit-A": _message("unit-A"),
+            "unit-B": _message("unit-B", setpoint=24),
+        }
+    )
+    coordinator, entity_ids = _setup(hass, units, client)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_UNITS,
+        {
+            "entity_id": entity_ids + ["climate.not_ours"],
+            "hvac_mode": "cool",
+            "temperature": 22,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    results = response["units"]
+    assert results[entity_ids[0]] == {"success": True}
+    assert results[entity_ids[1]]["success"] is False
+    assert results[entity_ids[2]] == {"success": False, "error": "boom"}
+    assert results["climate.not_ours"]["success"] is False
+    for unit in units[:2]:
+        unit.set_opration_mode.assert_awaited_once_with("COOL")
+        unit.turn_on.assert_awaited_once()
+        unit.set_temperature_set_point.assert_awaited_once_with(22)
+    # Both unconfirmed units were refreshed with one bulk request.
+    client.get_updated_controllable_units.assert_awaited_once()
+    assert coordinator.request_counts["refresh"] == 1
+
+
+async def test_set_units_ws_confirmation_skips_refresh(hass):
+    units = [_make_unit("unit-A")]
+    client = MagicMock()
+    client.get_updated_controllable_unit = AsyncMock()
+    coordinator, entity_ids = _setup(hass, units, client)
+
+    async def _echo():
+        coordinator.async_handle_unit_update(
+            _message("unit-A", operation_status="off")
+        )
+
+    units[0].turn_off.side_effect = _echo
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_UNITS,
+        {"entity_id": entity_ids, "hvac_mode": "off"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {"units": {entity_ids[0]: {"success": True}}}
+    client.get_updated_controllable_unit.assert_not_awaited()
+
+
+async def test_set_units_requires_a_target_state(hass):
+    _setup(hass, [_make_unit("unit-A")], MagicMock())
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_UNITS,
+            {"entity_id": ["climate.unit_a"]},
+            blocking=True,
+        )
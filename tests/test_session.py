@@ -0,0 +1,37 @@
+"""Tests for the shared HTTP session and SSL context."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.cool_open_integration.session import (
+    async_get_ssl_context,
+    async_share_session,
+)
+
+SESSION = "custom_components.cool_open_integration.session"
+
+
+async def test_ssl_context_is_built_once(hass):
+    with patch(f"{SESSION}.client_context", return_value=MagicMock()) as build:
+        first = await async_get_ssl_context(hass)
+        second = await async_get_ssl_context(hass)
+
+    assert first is second
+    build.assert_called_once()
+
+
+async def test_client_rest_calls_use_home_assistant_session(hass):
+    client = MagicMock()
+    private_session = MagicMock(close=AsyncMock())
+    client.api_client.rest_client.pool_manager = private_session
+
+    with patch(f"{SESSION}.CoolAutomationClient", return_value=client):
+        await async_share_session(hass, MagicMock())
+        await async_share_session(hass, MagicMock())
+
+    rest_client = client.api_client.rest_client
+    assert rest_client.pool_manager is async_get_clientsession(hass)
+    assert rest_client.retry_client is None
+    private_session.close.assert_awaited_once()
@@ -0,0 +1,36 @@
+"""Tests for the rolling latency statistics."""
+from __future__ import annotations
+
+from custom_components.cool_open_integration.stats import RollingPercentiles
+
+
+def test_percentiles_use_nearest_rank():
+    histogram = RollingPercentiles()
+    for value in range(1, 101):
+        histogram.add(value / 1000)
+
+    assert histogram.percentile(50) == 0.05
+    assert histogram.as_dict() == {
+        "count": 100,
+        "p50_ms": 50.0,
+        "p95_ms": 95.0,
+        "p99_ms": 99.0,
+    }
+
+
+def test_window_keeps_only_recent_samples():
+    histogram = RollingPercentiles(size=3)
+    for value in (10, 1, 1, 1):
+        histogram.add(value)
+
+    assert len(histogram) == 3
+    assert histogram.percentile(99) == 1
+
+
+def test_empty_window_has_no_percentiles():
+    assert RollingPercentiles().as_dict() == {
+        "count": 0,
+        "p50_ms": None,
+        "p95_ms": None,
+        "p99_ms": None,
+    }
@@ -0,0 +1,138 @@
+"""Tests for the WS hub shared across coordinators."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from cool_open_client.ws_events import UnitUpdate
+
+from custom_components.cool_open_integration.coordinator import (
+    CoolAutomationDataUpdateCoordinator,
+)
+from custom_components.cool_open_integration.ws_hub import WsHub
+
+
+class _Client:
+    """A stand-in for the client singleton, streaming what `events` receives.
+
+    Like the library, it authenticates each connection with the token it
+    reads off the instance when connecting.
+    """
+
+    def __init__(self, events: asyncio.Queue) -> None:
+        # The singleton holds the token of the entry set up last.
+        self.token = "token-last"
+        self.events = events
+        self.tokens: list[str] = []
+        self.drops = 0
+
+    async def subscribe_unit_updates(self):
+        self.tokens.append(self.token)
+        if self.drops:
+            self.drops -= 1
+            raise ConnectionError
+        while True:
+            yield await self.events.get()
+
+
+def _make_coordinator(hass, client, *unit_ids):
+    units = []
+    for unit_id in unit_ids:
+        unit = MagicMock()
+        unit.id = unit_id
+        units.append(unit)
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, MagicMock(), client, units)
+    coordinator.async_handle_unit_update = MagicMock()
+    return coordinator
+
+
+async def test_coordinators_of_one_token_share_a_connection(hass):
+    events: asyncio.Queue = asyncio.Queue()
+    client = _Client(events)
+    hub = WsHub(hass)
+    first = _make_coordinator(hass, client, "unit-A")
+    second = _make_coordinator(hass, client, "unit-B")
+
+    unsubscribe_first = hub.async_subscribe("token-1", first)
+    unsubscribe_second = hub.async_subscribe("token-1", second)
+    message = SimpleNamespace(unit_id="unit-B")
+    events.put_nowait(UnitUpdate(message))
+    await hass.async_block_till_done()
+
+    assert client.tokens == ["token-1"]
+    first.async_handle_unit_update.assert_not_called()
+    second.async_handle_unit_update.assert_called_once_with(message)
+    assert first.ws_running and second.ws_running
+
+    task = hub.subscriptions["token-1"].task
+    unsubscribe_first()
+    assert not task.done()
+    assert not first.ws_running
+    unsubscribe_second()
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert hub.subscriptions == {}
+
+
+async def test_each_token_connects_with_its_own_credentials(hass):
+    client = _Client(asyncio.Queue())
+    hub = WsHub(hass)
+
+    unsubscribers = [
+        hub.async_subscribe("token-1", _make_coordinator(hass, client, "unit-A")),
+        hub.async_subscribe("token-2", _make_coordinator(hass, client, "unit-B")),
+    ]
+    await asyncio.sleep(0)
+
+    # Not the token the shared client singleton happens to hold.
+    assert sorted(client.tokens) == ["token-1", "token-2"]
+    assert client.token == "token-last"
+    for unsubscribe in unsubscribers:
+        unsubscribe()
+
+
+async def test_unit_held_by_two_coordinators_reaches_both(hass):
+    events: asyncio.Queue = asyncio.Queue()
+    client = _Client(events)
+    hub = WsHub(hass)
+    first = _make_coordinator(hass, client, "unit-A", "unit-B")
+    second = _make_coordinator(hass, client, "unit-A")
+
+    unsubscribe_first = hub.async_subscribe("token-1", first)
+    unsubscribe_second = hub.async_subscribe("token-1", second)
+    message = SimpleNamespace(unit_id="unit-A")
+    events.put_nowait(UnitUpdate(message))
+    await hass.async_block_till_done()
+
+    first.async_handle_unit_update.assert_called_once_with(message)
+    second.async_handle_unit_update.assert_called_once_with(message)
+
+    unsubscribe_second()
+    events.put_nowait(UnitUpdate(message))
+    await hass.async_block_till_done()
+    assert first.async_handle_unit_update.call_count == 2
+    assert second.async_handle_unit_update.call_count == 1
+    unsubscribe_first()
+
+
+async def test_stopped_pump_is_restarted(hass):
+    client = _Client(asyncio.Queue())
+    client.drops = 1
+    hub = WsHub(hass)
+    coordinator = _make_coordinator(hass, client, "unit-A")
+
+    with patch(
+        "custom_components.cool_open_integration.ws_hub.WS_RESTART_BASE_DELAY", 0
+    ):
+        unsubscribe = hub.async_subscribe("token-1", coordinator)
+        # The supervisor is a background task; let it cycle once.
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    subscription = hub.subscriptions["token-1"]
+    assert client.tokens == ["token-1", "token-1"]
+    assert subscription.restarts == 1
+    assert subscription.state == "running"
+    assert coordinator.ws_running
+    unsubscribe()
@@ -0,0 +1,110 @@
+"""Tests for recording WS traffic and replaying it."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cool_open_client.cool_automation_client import UnitUpdateMessage
+from cool_open_client.ws_events import Reconnected, UnitUpdate
+
+from custom_components.cool_open_integration.coordinator import (
+    CoolAutomationDataUpdateCoordinator,
+)
+from custom_components.cool_open_integration.ws_hub import _ws_pump
+from custom_components.cool_open_integration.ws_recording import (
+    WsRecorder,
+    async_replay,
+    read_recording,
+)
+
+RECORDING = "custom_components.cool_open_integration.ws_recording"
+
+
+def _message(setpoint: int) -> UnitUpdateMessage:
+    return UnitUpdateMessage(
+        unit_id="unit-A",
+        fan_mode="LOW",
+        operation_mode="COOL",
+        operation_status="on",
+        setpoint=setpoint,
+        swing="auto",
+        ambient_temperature=26,
+    )
+
+
+async def test_recorded_events_read_back(hass, tmp_path):
+    path = tmp_path / "ws.ndjson.gz"
+    recorder = WsRecorder(hass, path)
+
+    with patch(f"{RECORDING}.time.time", side_effect=[100.0, 100.5]):
+        recorder.async_record(UnitUpdate(_message(22)))
+        recorder.async_record(Reconnected())
+    await recorder.async_flush()
+    recorder.async_record(UnitUpdate(_message(23)))
+    await recorder.async_close()
+
+    events = await hass.async_add_executor_job(read_recording, path)
+    assert [timestamp for timestamp, _ in events[:2]] == [100.0, 100.5]
+    assert events[0][1].message == _message(22)
+    assert isinstance(events[1][1], Reconnected)
+    assert events[2][1].message.setpoint == 23
+
+
+async def test_full_recording_rotates(hass, tmp_path):
+    path = tmp_path / "ws.ndjson.gz"
+    recorder = WsRecorder(hass, path)
+
+    with patch(f"{RECORDING}.WS_RECORD_MAX_BYTES", 1), patch(
+        f"{RECORDING}.WS_RECORD_BACKUPS", 2
+    ):
+        for setpoint in (20, 21, 22, 23):
+            recorder.async_record(UnitUpdate(_message(setpoint)))
+            await recorder.async_flush()
+    await recorder.async_close()
+
+    assert sorted(file.name for file in tmp_path.iterdir()) == [
+        "ws.ndjson.gz",
+        "ws.ndjson.gz.1",
+        "ws.ndjson.gz.2",
+    ]
+    [(_, latest)] = await hass.async_add_executor_job(read_recording, path)
+    assert latest.message.setpoint == 23
+
+
+async def test_replay_feeds_the_coordinator(hass, tmp_path):
+    path = tmp_path / "ws.ndjson.gz"
+    recorder = WsRecorder(hass, path)
+    recorder.async_record(UnitUpdate(_message(22)))
+    recorder.async_record(UnitUpdate(_message(23)))
+    await recorder.async_close()
+    unit = MagicMock()
+    unit.id = "unit-A"
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, MagicMock(), MagicMock(), [unit])
+    coordinator.ws_running = True
+
+    assert await async_replay(coordinator, path, speed=0) == 2
+
+    assert [call.args[0].setpoint for call in unit._update_unit.call_args_list] == [
+        22,
+        23,
+    ]
+    # The live pump's state is not the replay's to change.
+    assert coordinator.ws_running
+
+
+async def test_pump_records_what_it_receives(hass):
+    async def _stream():
+        yield UnitUpdate(_message(22))
+        yield Reconnected()
+
+    client = MagicMock()
+    client.subscribe_unit_updates = MagicMock(return_value=_stream())
+    coordinator = CoolAutomationDataUpdateCoordinator(hass, MagicMock(), client, [])
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.ws_recorder = MagicMock()
+
+    await _ws_pump(coordinator)
+
+    record = coordinator.ws_recorder.async_record
+    recorded = [call.args[0] for call in record.call_args_list]
+    assert isinstance(recorded[0], UnitUpdate)
+    assert isinstance(recorded[1], Reconnected)